@@ -1,5 +1,11 @@
+import os
 import sys
 import re
+import functools
+import importlib
+import types
+from ._ir import Block, Span, _state, _state_codes, _text_spans
+from ._sgr import BG, BLINK, BOLD, DEFAULT_STATE, DIM, FG, ITALIC, REVERSE, STRIKE, UNDERLINE, _ansi_split_regex
 _basic_colors = {
     "black": "\033[30m", "red": "\033[31m", "green": "\033[32m",
     "yellow": "\033[33m", "blue": "\033[34m", "magenta": "\033[35m",
@@ -36,19 +42,36 @@ _style_property_map = {
     "border-color": "box",
     "border-radius": "box",
     "text-align": "box",
+    "width": "box", "max-width": "box",
     "bold": "attribute", "italic": "attribute", "underline": "attribute",
     "strikethrough": "attribute", "dim": "attribute", "blink": "attribute",
     "reverse": "attribute",
 }
-_ansi_escape_regex = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_SCAN_CACHE_SIZE = 4096
+@functools.lru_cache(maxsize=_SCAN_CACHE_SIZE)
+def _scan_ansi(s):
+    parts = _ansi_split_regex.split(s)
+    escapes = []
+    offset = 0
+    for i in range(1, len(parts), 2):
+        offset += len(parts[i - 1])
+        escapes.append((offset, parts[i]))
+    return "".join(parts[::2]), tuple(escapes)
 def strip_ansi(s):
-    return _ansi_escape_regex.sub('', s)
+    if not isinstance(s, str): s = str(s)
+    if '\x1b' not in s: return s
+    return _scan_ansi(s)[0]
+_VISIBLE_LEN_CACHE_SIZE = 4096
+@functools.lru_cache(maxsize=_VISIBLE_LEN_CACHE_SIZE)
+def _visible_len_cached(s):
+    if '\x1b' in s: s = strip_ansi(s)
+    if s.isascii(): return len(s)
+    from ._width import str_width
+    return str_width(s)
 def visible_len(s):
-    clean = strip_ansi(str(s))
-    try:
-        return sum(2 if ord(c) > 127 else 1 for c in clean)
-    except TypeError:
-        return 0 
+    if not isinstance(s, str): s = str(s)
+    if s.isascii() and '\x1b' not in s: return len(s)
+    return _visible_len_cached(s)
 def _parse_hex_color(hex_color):
     hex_color = hex_color.lstrip('#')
     if len(hex_color) == 3:
@@ -62,8 +85,9 @@ def _parse_hex_color(hex_color):
             return r, g, b
         except ValueError: return None
     return None
+_rgb_color_regex = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*[\d.]+\s*)?\)')
 def _parse_rgb_color(rgb_color):
-    match = re.match(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*[\d.]+\s*)?\)', rgb_color)
+    match = _rgb_color_regex.match(rgb_color)
     if match:
         try:
             r, g, b = map(int, match.groups())
@@ -79,44 +103,92 @@ def _parse_color_string(color_str):
     if color_str in _basic_colors or color_str in [k.replace('bg_', '') for k in _basic_bg_colors]:
         return color_str 
     return None 
-def _get_color_code(color_value, is_background=False):
-    if not color_value: return ""
+_color_modes = ("auto", "truecolor", "256", "16", "none")
+_color_mode = "auto"
+def _check_color_mode(mode):
+    mode = str(mode).lower().strip()
+    if mode not in _color_modes:
+        raise ValueError(f"Unknown color mode {mode!r}; expected one of {', '.join(_color_modes)}.")
+    return mode
+_detected_modes = None
+def set_color_mode(mode):
+    global _color_mode
+    _color_mode = _check_color_mode(mode)
+    if _detected_modes is not None: _detected_modes.clear()
+def detect_color_mode(stream=None):
+    global _detected_modes
+    stream = sys.stdout if stream is None else stream
+    mode = _detect_color_mode(stream)
+    if _detected_modes is None:
+        import weakref
+        _detected_modes = weakref.WeakKeyDictionary()
+    try:
+        _detected_modes[stream] = mode
+    except TypeError:
+        pass
+    return mode
+def _detected_color_mode(stream=None):
+    stream = sys.stdout if stream is None else stream
+    try:
+        return _detected_modes[stream]
+    except (KeyError, TypeError):
+        return detect_color_mode(stream)
+def _detect_color_mode(stream):
+    if os.environ.get("NO_COLOR"): return "none"
+    try:
+        is_tty = stream.isatty()
+    except (AttributeError, ValueError):
+        is_tty = False
+    if not is_tty: return "none"
+    term = os.environ.get("TERM", "").lower()
+    if term == "dumb": return "none"
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"): return "truecolor"
+    if "256color" in term: return "256"
+    return "16"
+def _resolve_color_mode(mode=None, stream=None):
+    mode = _color_mode if mode is None else _check_color_mode(mode)
+    return _detected_color_mode(stream) if mode == "auto" else mode
+_basic_color_indexes = {name: index for index, name in enumerate(_basic_colors)}
+def _get_color_value(color_value):
+    if not color_value: return None
     color_value_str = str(color_value).lower().strip()
-    basic_map = _basic_bg_colors if is_background else _basic_colors
-    basic_key = f"bg_{color_value_str}" if is_background else color_value_str
-    if basic_key in basic_map: return basic_map[basic_key]
-    rgb = None
-    if color_value_str.startswith('#'): rgb = _parse_hex_color(color_value_str)
-    elif color_value_str.startswith('rgb'): rgb = _parse_rgb_color(color_value_str)
-    if rgb:
-        r, g, b = rgb
-        prefix_code = "\033[48;2;" if is_background else "\033[38;2;"
-        return f"{prefix_code}{r};{g};{b}m"
-    return "" 
+    if color_value_str in _basic_color_indexes: return _basic_color_indexes[color_value_str]
+    if color_value_str.startswith('#'): return _parse_hex_color(color_value_str)
+    if color_value_str.startswith('rgb'): return _parse_rgb_color(color_value_str)
+    return None
+_inline_markdown_passes = (
+    ('~', re.compile(r'(?<!\\)~(.*?)~'), f'{_attributes["strikethrough"]}\\1{_attribute_resets["strikethrough"]}'),
+    ('**', re.compile(r'(?<!\\)\*\*(.*?)\*\*'), f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}'),
+    ('__', re.compile(r'(?<!\\)__(.*?)__'), f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}'),
+    ('_', re.compile(r'(?<!\\)(?<!\w)_(.*?)_(?!\w)'), f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}'),
+    ('*', re.compile(r'(?<!\\)\*(.*?)\*'), f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}'),
+)
+_INLINE_MARKDOWN_CACHE_SIZE = 4096
+@functools.lru_cache(maxsize=_INLINE_MARKDOWN_CACHE_SIZE)
+def _parse_inline_markdown_cached(text):
+    for marker, pattern, replacement in _inline_markdown_passes:
+        if marker in text: text = pattern.sub(replacement, text)
+    if '\\' in text:
+        text = text.replace('\\*', '*').replace('\\_', '_').replace('\\~', '~')
+    return text
 def _parse_inline_markdown(text):
     if not isinstance(text, str): text = str(text)
-    text = re.sub(r'(?<!\\)~(.*?)~', f'{_attributes["strikethrough"]}\\1{_attribute_resets["strikethrough"]}', text)
-    text = re.sub(r'(?<!\\)\*\*(.*?)\*\*', f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}', text)
-    text = re.sub(r'(?<!\\)__(.*?)__', f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}', text)
-    text = re.sub(r'(?<!\\)(?<!\w)_(.*?)_(?!\w)', f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}', text)
-    text = re.sub(r'(?<!\\)\*(.*?)\*', f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}', text)
-    text = text.replace('\\*', '*').replace('\\_', '_').replace('\\~', '~')
-    return text
-def _align_line(line, width, align="left"):
-    vis_len = visible_len(line)
+    if '*' not in text and '_' not in text and '~' not in text: return text
+    return _parse_inline_markdown_cached(text)
+def _alignment_padding(vis_len, width, align="left"):
     total_pad = max(0, width - vis_len)
-    if align == "right": return ' ' * total_pad + line
+    if align == "right": return total_pad, 0
     elif align == "center":
         left_pad = total_pad // 2
-        right_pad = total_pad - left_pad
-        return ' ' * left_pad + line + ' ' * right_pad
-    else: return line + ' ' * total_pad 
-def _get_border_chars(is_rounded, border_color_code=""):
-    reset = _reset_code if border_color_code else ""
-    if is_rounded: chars = {'h': '─', 'v': '│', 'tl': '╭', 'tr': '╮', 'bl': '╰', 'br': '╯', 'vr': '┤', 'vl': '├', 'hb': '┴', 'ht': '┬', 'hc': '┼'}
-    else: chars = {'h': '─', 'v': '│', 'tl': '┌', 'tr': '┐', 'bl': '└', 'br': '┘', 'vr': '┤', 'vl': '├', 'hb': '┴', 'ht': '┬', 'hc': '┼'}
-    styled_chars = {k: f"{border_color_code}{v}{reset}" for k, v in chars.items()}
-    return styled_chars
+        return left_pad, total_pad - left_pad
+    else: return 0, total_pad
+def _align_line(line, width, align="left"):
+    left_pad, right_pad = _alignment_padding(visible_len(line), width, align)
+    return ' ' * left_pad + line + ' ' * right_pad
+def _get_border_chars(is_rounded):
+    if is_rounded: return {'h': '─', 'v': '│', 'tl': '╭', 'tr': '╮', 'bl': '╰', 'br': '╯', 'vr': '┤', 'vl': '├', 'hb': '┴', 'ht': '┬', 'hc': '┼'}
+    return {'h': '─', 'v': '│', 'tl': '┌', 'tr': '┐', 'bl': '└', 'br': '┘', 'vr': '┤', 'vl': '├', 'hb': '┴', 'ht': '┬', 'hc': '┼'}
+_table_separator_regex = re.compile(r'\s*\|? *[:\-]+ *\|')
 def _parse_padding(styles):
     p = styles.get("padding")
     pt = styles.get("padding-top")
@@ -147,123 +219,6 @@ def _parse_padding(styles):
     try: pad_left = int(pl) if pl is not None else p_l
     except (ValueError, TypeError): pad_left = p_l
     return max(0, pad_top), max(0, pad_right), max(0, pad_bottom), max(0, pad_left)
-def _parse_markdown_table(lines):
-    if not lines or len(lines) < 2: raise ValueError("Markdown table requires at least header and separator lines.")
-    header_line = lines[0]; separator_line = lines[1]; data_lines = lines[2:]
-    if '|' not in header_line or not re.match(r'\s*\|? *[:\-]+ *\|', separator_line): raise ValueError("Input does not look like a valid Markdown table.")
-    headers = [h.strip() for h in header_line.strip('|').split('|')]
-    num_columns = len(headers)
-    alignments = []
-    parts = separator_line.strip('|').split('|')
-    if len(parts) != num_columns: 
-        num_columns = min(len(parts), num_columns)
-        headers = headers[:num_columns]
-        parts = parts[:num_columns]
-    for part in parts:
-        part = part.strip()
-        if part.startswith(':') and part.endswith(':'): alignments.append("center")
-        elif part.endswith(':'): alignments.append("right")
-        else: alignments.append("left") 
-    data_rows = []
-    for line in data_lines:
-        if not line.strip() or '|' not in line : continue
-        cells = [cell.strip() for cell in line.strip('|').split('|')]
-        if len(cells) < num_columns: cells.extend([''] * (num_columns - len(cells)))
-        data_rows.append(cells[:num_columns])
-    return headers, alignments, data_rows
-def _render_markdown_table(headers, alignments, data_rows, styles):
-    has_border = styles.get("border", True) 
-    if isinstance(has_border, str): has_border = has_border.lower() not in ('false', '0', '')
-    else: has_border = bool(has_border)
-    is_rounded = styles.get("border-radius", False)
-    if isinstance(is_rounded, str): is_rounded = is_rounded.lower() not in ('false', '0', '')
-    else: is_rounded = bool(is_rounded)
-    is_rounded = is_rounded and has_border 
-    default_border_color = styles.get("color", "") 
-    border_color_val = styles.get("border-color", default_border_color)
-    border_color_code = _get_color_code(border_color_val, False) if has_border else ""
-    border_chars = _get_border_chars(is_rounded, border_color_code) if has_border else {}
-    pad_top, pad_right, pad_bottom, pad_left = _parse_padding(styles)
-    text_fg_code = _get_color_code(styles.get("color", ""), False)
-    text_bg_code = _get_color_code(styles.get("background-color", ""), True)
-    text_attrs = []
-    for key, value in styles.items():
-        property_type = _style_property_map.get(key)
-        val_str = str(value).lower().strip() if value is not None else ""
-        if property_type == "attribute":
-            attr_key = None
-            if key == "font-weight" and val_str == "bold": attr_key = "bold"
-            elif key == "font-style" and val_str == "italic": attr_key = "italic"
-            elif key == "text-decoration":
-                if val_str == "underline": attr_key = "underline"
-                elif val_str in ("line-through", "strikethrough"): attr_key = "strikethrough"
-            elif key == "visibility":
-                if val_str == "dim": attr_key = "dim"
-            elif key in _attributes: 
-                attr_key = key
-            if attr_key and val_str not in ('false', '0', '', 'normal', 'none'):
-                attr_code = _attributes.get(attr_key)
-                if attr_code: text_attrs.append(attr_code)
-    text_style_prefix = f"{text_fg_code}{text_bg_code}{''.join(text_attrs)}"
-    cell_reset_code = _reset_code 
-    num_columns = len(headers)
-    column_widths = [0] * num_columns
-    for i in range(num_columns):
-         header_len = visible_len(_parse_inline_markdown(headers[i])) 
-         max_data_len = 0
-         if data_rows:
-             max_data_len = max(visible_len(_parse_inline_markdown(row[i] if i < len(row) else "")) for row in data_rows)
-         column_widths[i] = max(header_len, max_data_len)
-    output_lines = []
-    col_sep = border_chars.get('v', '|') if has_border else " "
-    h_sep = border_chars.get('h', '-') 
-    if has_border:
-        top_border = border_chars['tl']
-        for i, width in enumerate(column_widths):
-            top_border += h_sep * (width + pad_left + pad_right)
-            if i < num_columns - 1: top_border += border_chars['ht'] 
-        top_border += border_chars['tr']
-        output_lines.append(top_border)
-    header_row_str = border_chars.get('vl', '|') if has_border else ""
-    for i, header in enumerate(headers):
-        parsed_header = _parse_inline_markdown(header) 
-        styled_header = f"{text_style_prefix}{parsed_header}{cell_reset_code}"
-        aligned_header = _align_line(styled_header, column_widths[i], alignments[i])
-        left_pad_str = f"{text_bg_code}{' ' * pad_left}{cell_reset_code}" if pad_left > 0 else ""
-        right_pad_str = f"{text_bg_code}{' ' * pad_right}{cell_reset_code}" if pad_right > 0 else ""
-        header_row_str += f"{left_pad_str}{aligned_header}{right_pad_str}"
-        if i < num_columns - 1: header_row_str += col_sep
-    header_row_str += border_chars.get('vr', '|') if has_border else ""
-    output_lines.append(header_row_str)
-    if has_border:
-        separator_border = border_chars['vl'] 
-        for i, width in enumerate(column_widths):
-            separator_border += h_sep * (width + pad_left + pad_right)
-            if i < num_columns - 1: separator_border += border_chars['hc'] 
-        separator_border += border_chars['vr'] 
-        output_lines.append(separator_border)
-    for row_data in data_rows:
-        data_row_str = border_chars.get('vl', '|') if has_border else ""
-        for i, cell_content in enumerate(row_data):
-            if i >= num_columns: continue 
-            parsed_cell = _parse_inline_markdown(cell_content)
-            styled_cell = f"{text_style_prefix}{parsed_cell}{cell_reset_code}"
-            alignment = alignments[i] if i < len(alignments) else "left"
-            aligned_cell = _align_line(styled_cell, column_widths[i], alignment)
-            left_pad_str = f"{text_bg_code}{' ' * pad_left}{cell_reset_code}" if pad_left > 0 else ""
-            right_pad_str = f"{text_bg_code}{' ' * pad_right}{cell_reset_code}" if pad_right > 0 else ""
-            data_row_str += f"{left_pad_str}{aligned_cell}{right_pad_str}"
-            if i < num_columns - 1: data_row_str += col_sep
-        data_row_str += border_chars.get('vr', '|') if has_border else ""
-        output_lines.append(data_row_str)
-    if has_border:
-        bottom_border = border_chars['bl']
-        for i, width in enumerate(column_widths):
-            bottom_border += h_sep * (width + pad_left + pad_right)
-            if i < num_columns - 1: bottom_border += border_chars['hb'] 
-        bottom_border += border_chars['br']
-        output_lines.append(bottom_border)
-    return output_lines
 def _parse_style_string(style_string):
     if not isinstance(style_string, str):
         return {}
@@ -280,6 +235,7 @@ def _parse_style_string(style_string):
         elif part == "border": styles["border"] = True
         elif part == "rounded": styles["border-radius"] = True
         elif part == "hidden": styles["visibility"] = "hidden"
+        elif part == "minimize": styles["minimize"] = True
         elif part.startswith("text-"):
             color_val = part[len("text-"):]
             if _parse_color_string(color_val) or color_val in _basic_colors:
@@ -294,6 +250,8 @@ def _parse_style_string(style_string):
              potential_color = part[len("border-"):]
              if _parse_color_string(potential_color) or potential_color in _basic_colors:
                  styles["border-color"] = potential_color
+        elif part.startswith("max-w-"): styles["max-width"] = part[len("max-w-"):]
+        elif part.startswith("w-"): styles["width"] = part[len("w-"):]
         elif part == "text-left": styles["text-align"] = "left"
         elif part == "text-center": styles["text-align"] = "center"
         elif part == "text-right": styles["text-align"] = "right"
@@ -302,41 +260,30 @@ def _parse_style_string(style_string):
         elif part in _basic_bg_colors:
              styles["background-color"] = part.replace("bg_", "") 
     return styles
-def printc(content, styles=None, markdown=False, **kwargs):
-    initial_styles = {}
-    if isinstance(styles, str):
-        initial_styles = _parse_style_string(styles)
-    elif isinstance(styles, dict):
-        initial_styles = styles.copy()
-    effective_styles = initial_styles
-    processed_kwargs = {k.replace('_', '-'): v for k, v in kwargs.items()}
-    effective_styles.update(processed_kwargs) 
-    if effective_styles.get("visibility") == "hidden":
-        return 
-    is_markdown_table = False
-    if markdown:
-        lines = str(content).strip().split('\n')
-        if len(lines) >= 2 and '|' in lines[0] and re.match(r'\s*\|? *[:\-]+ *\|', lines[1]):
-            try:
-                headers, alignments, table_data = _parse_markdown_table(lines)
-
-                rendered_table_lines = _render_markdown_table(headers, alignments, table_data, effective_styles)
-                for line in rendered_table_lines:
-                    sys.stdout.write(line + "\n")
-                sys.stdout.flush()
-                return 
-            except ValueError:
-                 pass 
-        is_markdown_table = False 
-    content_str = str(content)
-    lines = content_str.split('\n')
-    if markdown and not is_markdown_table:
-        lines = [_parse_inline_markdown(line) for line in lines]
-    text_fg_code = _get_color_code(effective_styles.get("color", ""), False)
-    text_bg_code = _get_color_code(effective_styles.get("background-color", ""), True)
+def _parse_width(value):
+    if value is None: return None
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value == "auto": return value
+    try: width = int(value)
+    except (ValueError, TypeError): return None
+    return width if width > 0 else None
+def _terminal_width():
+    import shutil
+    return shutil.get_terminal_size().columns
+def _resolve_width(style):
+    width = style.width if style.width is not None else style.max_width
+    return _terminal_width() if width == "auto" else width
+def _parse_flag(value):
+    if isinstance(value, str): return value.lower() not in ('false', '0', '')
+    return bool(value)
+_attribute_fields = {
+    "bold": BOLD, "dim": DIM, "italic": ITALIC, "underline": UNDERLINE,
+    "blink": BLINK, "reverse": REVERSE, "strikethrough": STRIKE,
+}
+def _get_attribute_names(styles):
     text_attrs = []
-    needs_reset = False 
-    for key, value in effective_styles.items():
+    for key, value in styles.items():
         property_type = _style_property_map.get(key)
         val_str = str(value).lower().strip() if value is not None else ""
         if property_type == "attribute":
@@ -350,62 +297,219 @@ def printc(content, styles=None, markdown=False, **kwargs):
                  if val_str == "dim": attr_key = "dim"
             elif key in _attributes: 
                 attr_key = key
-            if attr_key and val_str not in ('false', '0', '', 'normal', 'none'):
-                attr_code = _attributes.get(attr_key)
-                if attr_code:
-                    text_attrs.append(attr_code)
-                    needs_reset = True 
-    text_style_prefix = f"{text_fg_code}{text_bg_code}{''.join(text_attrs)}"
-    if text_fg_code or text_bg_code: needs_reset = True 
-    style_reset_code = _reset_code 
-    has_border = effective_styles.get("border", False)
-    if isinstance(has_border, str): has_border = has_border.lower() not in ('false', '0', '')
-    else: has_border = bool(has_border)
-    is_rounded = effective_styles.get("border-radius", False)
-    if isinstance(is_rounded, str): is_rounded = is_rounded.lower() not in ('false', '0', '')
-    else: is_rounded = bool(is_rounded)
-    is_rounded = is_rounded and has_border 
-    default_border_color = effective_styles.get("color", "") 
-    border_color_val = effective_styles.get("border-color", default_border_color)
-    border_color_code = _get_color_code(border_color_val, False) if has_border else ""
-    if border_color_code: needs_reset = True 
-    text_align = effective_styles.get("text-align", "left")
-    pad_top, pad_right, pad_bottom, pad_left = _parse_padding(effective_styles)
+            if attr_key and val_str not in ('false', '0', '', 'normal', 'none') and attr_key in _attributes:
+                text_attrs.append(attr_key)
+    return text_attrs
+def _make_state(fg=None, bg=None, attributes=()):
+    state = list(DEFAULT_STATE)
+    state[FG] = fg
+    state[BG] = bg
+    for name in attributes: state[_attribute_fields[name]] = True
+    return _state(state)
+class Style:
+    __slots__ = (
+        "styles", "hidden", "text_state", "bg_state", "border_state", "padding",
+        "border", "border_chars", "table_border", "table_border_chars", "align",
+        "width", "max_width", "color_mode", "minimize", "_key",
+    )
+    def __init__(self, styles, color_mode="truecolor", _key=None):
+        styles = dict(styles)
+        color_mode = _check_color_mode(color_mode)
+        if color_mode == "auto": color_mode = _detected_color_mode()
+        init = functools.partial(object.__setattr__, self)
+        init("_key", (_key if _key is not None else _freeze_style_items(styles.items()), color_mode))
+        init("styles", types.MappingProxyType(styles))
+        init("hidden", styles.get("visibility") == "hidden")
+        init("color_mode", color_mode)
+        has_border = _parse_flag(styles.get("border", False))
+        table_border = _parse_flag(styles.get("border", True))
+        is_rounded = _parse_flag(styles.get("border-radius", False))
+        border_chars = types.MappingProxyType(_get_border_chars(is_rounded))
+        fg_value = _get_color_value(styles.get("color", ""))
+        bg_value = _get_color_value(styles.get("background-color", ""))
+        init("text_state", _make_state(fg_value, bg_value, _get_attribute_names(styles)))
+        init("bg_state", _make_state(bg=bg_value))
+        init("border_state", _make_state(_get_color_value(styles.get("border-color", styles.get("color", "")))))
+        init("border", has_border)
+        init("border_chars", border_chars if has_border else types.MappingProxyType({}))
+        init("table_border", table_border)
+        init("table_border_chars", border_chars if table_border else types.MappingProxyType({}))
+        padding = _parse_padding(styles)
+        init("padding", padding)
+        init("align", styles.get("text-align", "left"))
+        init("width", _parse_width(styles.get("width")))
+        init("max_width", _parse_width(styles.get("max-width")))
+        init("minimize", color_mode != "none" and _parse_flag(styles.get("minimize", False)))
+    def __setattr__(self, name, value):
+        raise AttributeError("Style objects are immutable")
+    def __delattr__(self, name):
+        raise AttributeError("Style objects are immutable")
+    def __eq__(self, other):
+        if not isinstance(other, Style): return NotImplemented
+        return self._key == other._key
+    def __hash__(self):
+        return hash(self._key)
+    def __repr__(self):
+        return f"Style({dict(self.styles)!r}, color_mode={self.color_mode!r})"
+    def __reduce__(self):
+        return (Style, (dict(self.styles), self.color_mode))
+_STYLE_CACHE_SIZE = 256
+def _freeze_style_value(value):
+    if isinstance(value, (list, tuple)): return tuple(_freeze_style_value(v) for v in value)
+    if isinstance(value, dict): return tuple((k, _freeze_style_value(v)) for k, v in value.items())
+    return value
+def _freeze_style_items(items):
+    return tuple((k, _freeze_style_value(v)) for k, v in items)
+@functools.lru_cache(maxsize=_STYLE_CACHE_SIZE)
+def _compile_style_cached(source_kind, source, kwargs_items, color_mode):
+    if source_kind == "str":
+        effective_styles = _parse_style_string(source)
+    else:
+        effective_styles = dict(source)
+    effective_styles.update(kwargs_items)
+    return Style(effective_styles, color_mode)
+def _compile_style(styles, kwargs, stream=None):
+    if isinstance(styles, Style):
+        if not kwargs: return styles
+        source_kind, source = "items", styles._key[0]
+        kwargs = {"color_mode": styles.color_mode, **kwargs}
+    elif isinstance(styles, str):
+        source_kind, source = "str", " ".join(styles.lower().split())
+    elif isinstance(styles, dict):
+        source_kind, source = "items", _freeze_style_items(styles.items())
+    else:
+        source_kind, source = "items", ()
+    kwargs_items = _freeze_style_items((k.replace('_', '-'), v) for k, v in kwargs.items())
+    requested_mode = dict(kwargs_items).get("color-mode")
+    if requested_mode is None and source_kind == "items":
+        requested_mode = dict(source).get("color-mode")
+    color_mode = _resolve_color_mode(requested_mode, stream)
+    try:
+        return _compile_style_cached(source_kind, source, kwargs_items, color_mode)
+    except TypeError:
+        effective_styles = _parse_style_string(source) if source_kind == "str" else dict(source)
+        effective_styles.update(kwargs_items)
+        return Style(effective_styles, color_mode)
+def compile_style(styles=None, **kwargs):
+    return _compile_style(styles, kwargs)
+def _render_block(content, style, markdown=False, workers=None):
+    if style.hidden:
+        return Block()
+    is_markdown_table = False
+    if markdown:
+        lines = str(content).strip().split('\n')
+        if len(lines) >= 2 and '|' in lines[0] and _table_separator_regex.match(lines[1]):
+            from ._table import _parse_markdown_table, _render_markdown_table
+            try:
+                headers, alignments, table_data = _parse_markdown_table(lines)
+
+                return _render_markdown_table(headers, alignments, table_data, style, workers)
+            except ValueError:
+                 pass 
+        is_markdown_table = False 
+    content_str = str(content)
+    lines = content_str.split('\n')
+    if markdown and not is_markdown_table:
+        lines = [_parse_inline_markdown(line) for line in lines]
+    text_state = style.text_state
+    bg_state = style.bg_state
+    border_state = style.border_state
+    has_border = style.border
+    border_chars = style.border_chars
+    text_align = style.align
+    pad_top, pad_right, pad_bottom, pad_left = style.padding
+    width_limit = _resolve_width(style)
+    if width_limit is not None:
+        content_limit = max(1, width_limit - pad_left - pad_right - (2 if has_border else 0))
+        if any(visible_len(line) > content_limit for line in lines):
+            from ._wrap import wrap_visible
+            base = _state_codes(text_state)
+            lines = [wrapped for line in lines for wrapped in wrap_visible(line, content_limit, base)]
     max_content_width = 0
     if lines:
         max_content_width = max(visible_len(line) for line in lines)
+    if style.width is not None:
+        max_content_width = content_limit
     inner_width = max_content_width + pad_left + pad_right
     output_lines = []
-    border_chars = {}
+    edge = ()
     if has_border:
-        border_chars = _get_border_chars(is_rounded, border_color_code)
         h_sep = border_chars.get('h', '-') 
-        top_border = f"{border_chars['tl']}{h_sep * inner_width}{border_chars['tr']}"
-        output_lines.append(top_border)
-    pad_line_content = f"{text_bg_code}{' ' * inner_width}{style_reset_code if text_bg_code else ''}"
+        output_lines.append((border_state, f"{border_chars['tl']}{h_sep * inner_width}{border_chars['tr']}"))
+        edge = (border_state, border_chars['v'])
+    pad_line_content = (bg_state, ' ' * inner_width)
+    has_bg = bg_state[BG] is not None
     for _ in range(pad_top):
         if has_border:
-            output_lines.append(f"{border_chars['v']}{pad_line_content}{border_chars['v']}")
-        elif text_bg_code: 
+            output_lines.append((*edge, *pad_line_content, *edge))
+        elif has_bg: 
              output_lines.append(pad_line_content)
+    line_head = (*edge, bg_state, ' ' * pad_left)
+    line_tail = (bg_state, ' ' * pad_right, *edge)
     for line in lines:
         aligned_line = _align_line(line, max_content_width, text_align)
-        left_pad_str = f"{text_bg_code}{' ' * pad_left}{style_reset_code if text_bg_code else ''}"
-        right_pad_str = f"{text_bg_code}{' ' * pad_right}{style_reset_code if text_bg_code else ''}"
-        full_inner_line = f"{left_pad_str}{text_style_prefix}{aligned_line}{style_reset_code if needs_reset else ''}{right_pad_str}"
-        if has_border:
-            output_lines.append(f"{border_chars['v']}{full_inner_line}{border_chars['v']}")
-        else:
-            output_lines.append(full_inner_line) 
+        output_lines.append((*line_head, *_text_spans(aligned_line, text_state), *line_tail))
     for _ in range(pad_bottom):
         if has_border:
-            output_lines.append(f"{border_chars['v']}{pad_line_content}{border_chars['v']}")
-        elif text_bg_code:
+            output_lines.append((*edge, *pad_line_content, *edge))
+        elif has_bg:
              output_lines.append(pad_line_content)
     if has_border:
         h_sep = border_chars.get('h', '-')
-        bottom_border = f"{border_chars['bl']}{h_sep * inner_width}{border_chars['br']}"
-        output_lines.append(bottom_border)
-    for line in output_lines:
-        sys.stdout.write(line + "\n")
-    sys.stdout.flush()
+        output_lines.append((border_state, f"{border_chars['bl']}{h_sep * inner_width}{border_chars['br']}"))
+    return Block(output_lines, inner_width + (2 if has_border else 0), style.color_mode, style.minimize)
+def _render_lines(content, style, markdown=False, workers=None):
+    return _render_block(content, style, markdown, workers).ansi_lines()
+_WRITE_CHUNK_SIZE = 1 << 20
+def render(content, styles=None, markdown=False, workers=None, **kwargs):
+    return "\n".join(_render_lines(content, compile_style(styles, **kwargs), markdown, workers))
+def render_block(content, styles=None, markdown=False, workers=None, **kwargs):
+    return _render_block(content, compile_style(styles, **kwargs), markdown, workers)
+def printc(content, styles=None, markdown=False, file=None, workers=None, **kwargs):
+    out = file if file is not None else sys.stdout
+    style = _compile_style(styles, kwargs, out)
+    if style.hidden:
+        return 
+    output_lines = _render_lines(content, style, markdown, workers)
+    out.write("".join(line + "\n" for line in output_lines))
+    out.flush()
+def printc_many(items, styles=None, markdown=False, file=None, flush=True, **kwargs):
+    out = file if file is not None else sys.stdout
+    style = _compile_style(styles, kwargs, out)
+    if style.hidden:
+        return 
+    buffer = []
+    buffered_size = 0
+    for item in items:
+        for line in _render_lines(item, style, markdown):
+            buffer.append(line)
+            buffer.append("\n")
+            buffered_size += len(line) + 1
+        if buffered_size >= _WRITE_CHUNK_SIZE:
+            out.write("".join(buffer))
+            buffer.clear()
+            buffered_size = 0
+    if buffer:
+        out.write("".join(buffer))
+    if flush:
+        out.flush()
+_lazy_attributes = {
+    "LiveRegion": "._live",
+    "AsyncConsoleWriter": "._sink", "ConsoleWriter": "._sink", "aprintc": "._sink",
+    "render_table": "._table", "stream_table": "._table", "table": "._table", "table_block": "._table",
+    "minimize_ansi": "._sgr",
+}
+__all__ = [
+    "AsyncConsoleWriter", "Block", "ConsoleWriter", "LiveRegion", "Span", "Style", "aprintc", "compile_style",
+    "detect_color_mode", "minimize_ansi", "printc", "printc_many", "render", "render_block", "render_table",
+    "set_color_mode", "stream_table", "strip_ansi", "table", "table_block", "visible_len",
+]
+def __getattr__(name):
+    module_name = _lazy_attributes.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
@@ -0,0 +1,43 @@
+import functools
+import html
+from ._palette import xterm_rgb
+from ._sgr import BG, BLINK, BOLD, DIM, FG, ITALIC, REVERSE, STRIKE, UNDERLINE
+_decorations = ((UNDERLINE, "underline"), (STRIKE, "line-through"), (BLINK, "blink"))
+def _css_color(value):
+    r, g, b = xterm_rgb(value) if isinstance(value, int) else value
+    return f"#{r:02x}{g:02x}{b:02x}"
+@functools.lru_cache(maxsize=256)
+def _css(state):
+    fg = _css_color(state[FG]) if state[FG] is not None else None
+    bg = _css_color(state[BG]) if state[BG] is not None else None
+    if state[REVERSE]: fg, bg = bg or "Canvas", fg or "CanvasText"
+    declarations = []
+    if fg: declarations.append(f"color:{fg}")
+    if bg: declarations.append(f"background-color:{bg}")
+    if state[BOLD]: declarations.append("font-weight:bold")
+    if state[DIM]: declarations.append("opacity:0.5")
+    if state[ITALIC]: declarations.append("font-style:italic")
+    decorations = [name for field, name in _decorations if state[field]]
+    if decorations: declarations.append(f"text-decoration:{' '.join(decorations)}")
+    return ";".join(declarations)
+def _html_run(out, css, texts):
+    text = html.escape("".join(texts), quote=False)
+    out.append(f'<span style="{css}">{text}</span>' if css else text)
+def block_html(block):
+    out = ['<pre class="color">']
+    for line_index, line in enumerate(block.lines):
+        if line_index: out.append("\n")
+        run_css = ""
+        run = []
+        for i in range(0, len(line), 2):
+            state, text = line[i], line[i + 1]
+            if state is None or not text: continue
+            css = _css(state)
+            if css != run_css and run:
+                _html_run(out, run_css, run)
+                run = []
+            run_css = css
+            run.append(text)
+        if run: _html_run(out, run_css, run)
+    out.append("</pre>")
+    return "".join(out)
@@ -0,0 +1,170 @@
+import functools
+from ._sgr import (
+    BG, DEFAULT_STATE, FG, UnsupportedSGR, _RESET, _ansi_split_regex, _sgr_regex, apply_sgr, transition,
+)
+_FORMATS = ("ansi", "plain", "html")
+_STATES_SIZE = 4096
+_states = {}
+def _state(values):
+    values = tuple(values)
+    state = _states.get(values)
+    if state is None:
+        if len(_states) >= _STATES_SIZE: _states.clear()
+        state = _states[values] = values
+    return state
+_DEFAULT = _state(DEFAULT_STATE)
+_SPAN_FIELDS = ("fg", "bg", "bold", "dim", "italic", "underline", "blink", "reverse", "strikethrough")
+class Span:
+    __slots__ = ("text",) + _SPAN_FIELDS
+    def __init__(self, text, fg=None, bg=None, bold=False, dim=False, italic=False, underline=False, blink=False, reverse=False, strikethrough=False):
+        self.text = text
+        self.fg = fg
+        self.bg = bg
+        self.bold = bold
+        self.dim = dim
+        self.italic = italic
+        self.underline = underline
+        self.blink = blink
+        self.reverse = reverse
+        self.strikethrough = strikethrough
+    @property
+    def state(self):
+        return tuple(getattr(self, name) for name in _SPAN_FIELDS)
+    def __eq__(self, other):
+        if not isinstance(other, Span): return NotImplemented
+        return self.text == other.text and self.state == other.state
+    __hash__ = None
+    def __repr__(self):
+        fields = "".join(f", {name}={value!r}" for name, value in zip(_SPAN_FIELDS, self.state) if value)
+        return f"Span({self.text!r}{fields})"
+def _color_param(value, background, mode):
+    if isinstance(value, int):
+        if value < 8: return str((40 if background else 30) + value)
+        if value < 16: return str((100 if background else 90) + value - 8)
+        if mode == "16":
+            from ._palette import nearest_16, xterm_rgb
+            return _color_param(nearest_16(*xterm_rgb(value)), background, mode)
+        return f"{48 if background else 38};5;{value}"
+    if mode == "256":
+        from ._palette import nearest_256
+        return f"{48 if background else 38};5;{nearest_256(*value)}"
+    if mode == "16":
+        from ._palette import nearest_16
+        return _color_param(nearest_16(*value), background, mode)
+    r, g, b = value
+    return f"{48 if background else 38};2;{r};{g};{b}"
+def _color_value(param):
+    if param is None: return None
+    params = param.split(';')
+    if len(params) == 1:
+        code = int(param)
+        return code % 10 + (8 if code >= 90 else 0)
+    if params[1] == '5': return min(255, int(params[2]))
+    return tuple(min(255, int(v)) for v in params[2:5])
+@functools.lru_cache(maxsize=1024)
+def _to_sgr(state, mode):
+    if mode == "none": return DEFAULT_STATE
+    sgr = list(state)
+    if state[FG] is not None: sgr[FG] = _color_param(state[FG], False, mode)
+    if state[BG] is not None: sgr[BG] = _color_param(state[BG], True, mode)
+    return tuple(sgr)
+@functools.lru_cache(maxsize=1024)
+def _from_sgr(sgr):
+    state = list(sgr)
+    state[FG] = _color_value(sgr[FG])
+    state[BG] = _color_value(sgr[BG])
+    return _state(state)
+def _state_codes(state):
+    return "" if state == DEFAULT_STATE else transition(DEFAULT_STATE, _to_sgr(state, "truecolor"))
+@functools.lru_cache(maxsize=1024)
+def _escape_state(state, escape):
+    match = _sgr_regex.fullmatch(escape)
+    if not match: return None
+    try:
+        return _from_sgr(apply_sgr(_to_sgr(state, "truecolor"), match.group(1)))
+    except UnsupportedSGR:
+        return None
+@functools.lru_cache(maxsize=4096)
+def _escaped_spans(text, state):
+    spans = []
+    parts = _ansi_split_regex.split(text)
+    for index in range(1, len(parts), 2):
+        if parts[index - 1]: spans += (state, parts[index - 1])
+        next_state = _escape_state(state, parts[index])
+        if next_state is None: spans += (None, parts[index])
+        else: state = next_state
+    if parts[-1]: spans += (state, parts[-1])
+    return tuple(spans)
+def _text_spans(text, state):
+    if '\x1b' not in text: return (state, text)
+    return _escaped_spans(text, state)
+@functools.lru_cache(maxsize=1024)
+def _line_codes(states, mode):
+    codes = []
+    previous = DEFAULT_STATE
+    for state in states:
+        if state is None:
+            codes.append("")
+            continue
+        target = _to_sgr(state, mode)
+        codes.append(transition(previous, target) if target != previous else "")
+        previous = target
+    return tuple(codes), _RESET if previous != DEFAULT_STATE else ""
+def _ansi_lines(lines, mode):
+    if mode == "none": return ["".join(line[1::2]) for line in lines]
+    out = []
+    states = None
+    for line in lines:
+        line_states = line[0::2]
+        if line_states != states:
+            states = line_states
+            codes, reset = _line_codes(states, mode)
+        parts = list(line)
+        parts[0::2] = codes
+        parts.append(reset)
+        out.append("".join(parts))
+    return out
+def _ansi_line(line, mode):
+    return _ansi_lines((line,), mode)[0]
+def _plain_line(line):
+    states = line[0::2]
+    if None not in states: return "".join(line[1::2])
+    return "".join([text for state, text in zip(states, line[1::2]) if state is not None])
+class Block:
+    __slots__ = ("lines", "width", "color_mode", "minimize")
+    def __init__(self, lines=None, width=0, color_mode="truecolor", minimize=False):
+        self.lines = lines if lines is not None else []
+        self.width = width
+        self.color_mode = color_mode
+        self.minimize = minimize
+    def _mode(self, color_mode):
+        if color_mode is None: return self.color_mode
+        from . import _resolve_color_mode
+        return _resolve_color_mode(color_mode)
+    def spans(self):
+        for line in self.lines:
+            yield [Span(line[i + 1], *line[i]) for i in range(0, len(line), 2) if line[i] is not None]
+    def ansi_lines(self, color_mode=None):
+        mode = self._mode(color_mode)
+        lines = _ansi_lines(self.lines, mode)
+        if self.minimize and mode != "none" and lines:
+            from ._sgr import minimize_ansi
+            return minimize_ansi("\n".join(lines)).split("\n")
+        return lines
+    def plain_lines(self):
+        return [_plain_line(line) for line in self.lines]
+    def ansi(self, color_mode=None):
+        return "\n".join(self.ansi_lines(color_mode))
+    def plain(self):
+        return "\n".join(self.plain_lines())
+    def html(self):
+        from ._html import block_html
+        return block_html(self)
+    def to_bytes(self, format="ansi", encoding="utf-8", color_mode=None):
+        if format not in _FORMATS: raise ValueError(f"format must be one of {', '.join(_FORMATS)}, not {format!r}")
+        text = self.ansi(color_mode) if format == "ansi" else getattr(self, format)()
+        return text.encode(encoding)
+    def __str__(self):
+        return self.ansi()
+    def __repr__(self):
+        return f"Block({len(self.lines)} lines, width={self.width}, color_mode={self.color_mode!r})"
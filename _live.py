@@ -0,0 +1,71 @@
+import sys
+import threading
+import time
+from . import _compile_style, _render_lines
+_CLEAR_TO_EOL = "\033[K"
+class LiveRegion:
+    def __init__(self, height=0, file=None, max_refresh=10.0):
+        self.file = file if file is not None else sys.stdout
+        self.height = max(0, int(height))
+        self.min_interval = 1.0 / max_refresh if max_refresh else 0.0
+        self._lines = []
+        self._pending = None
+        self._last_draw = None
+        self._timer = None
+        self._lock = threading.Lock()
+    def __enter__(self):
+        with self._lock:
+            if self.height and not self._lines:
+                self.file.write("\n" * self.height)
+                self.file.flush()
+                self._lines = [""] * self.height
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.refresh()
+        return False
+    def update(self, content, styles=None, markdown=False, **kwargs):
+        style = _compile_style(styles, kwargs, self.file)
+        lines = _render_lines(content, style, markdown)
+        with self._lock:
+            self._pending = lines
+            if self._last_draw is not None:
+                wait = self.min_interval - (time.monotonic() - self._last_draw)
+                if wait > 0:
+                    if self._timer is None:
+                        self._timer = threading.Timer(wait, self.refresh)
+                        self._timer.daemon = True
+                        self._timer.start()
+                    return
+            self._draw()
+    def refresh(self):
+        with self._lock:
+            self._draw()
+    def _draw(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending is None: return
+        lines, self._pending = self._pending, None
+        output = self._diff(lines)
+        if output:
+            self.file.write(output)
+            self.file.flush()
+        self._last_draw = time.monotonic()
+    def _diff(self, lines):
+        old_lines = self._lines
+        height = max(len(old_lines), len(lines), self.height)
+        new_lines = list(lines) + [""] * (height - len(lines))
+        output = []
+        changed = [i for i, old_line in enumerate(old_lines) if old_line != new_lines[i]]
+        if changed:
+            first, last = changed[0], changed[-1]
+            output.append(f"\r\033[{len(old_lines) - first}A")
+            for i in range(first, last + 1):
+                if old_lines[i] != new_lines[i]: output.append(new_lines[i] + _CLEAR_TO_EOL)
+                output.append("\n")
+            remaining = len(old_lines) - 1 - last
+            if remaining: output.append(f"\033[{remaining}B")
+        for line in new_lines[len(old_lines):]:
+            output.append(line + _CLEAR_TO_EOL + "\n")
+        self._lines = new_lines
+        return "".join(output)
@@ -0,0 +1,54 @@
+from array import array
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+_BASIC_PALETTE = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+_QUANT_BITS = 5
+_QUANT_SHIFT = 8 - _QUANT_BITS
+_quantized_256 = None
+_quantized_16 = None
+def _distance(r1, g1, b1, r2, g2, b2):
+    return (r1 - r2) ** 2 + (g1 - g2) ** 2 + (b1 - b2) ** 2
+def _cube_index(value):
+    if value < 48: return 0
+    if value < 115: return 1
+    return (value - 35) // 40
+def _compute_256(r, g, b):
+    ri, gi, bi = _cube_index(r), _cube_index(g), _cube_index(b)
+    cube_distance = _distance(r, g, b, _CUBE_LEVELS[ri], _CUBE_LEVELS[gi], _CUBE_LEVELS[bi])
+    gray_index = max(0, min(23, ((r + g + b) // 3 - 3) // 10))
+    gray = 8 + gray_index * 10
+    if _distance(r, g, b, gray, gray, gray) < cube_distance: return 232 + gray_index
+    return 16 + 36 * ri + 6 * gi + bi
+def _compute_16(r, g, b):
+    return min(range(16), key=lambda index: _distance(r, g, b, *_BASIC_PALETTE[index]))
+def _quantized_key(r, g, b):
+    return ((r >> _QUANT_SHIFT) << (2 * _QUANT_BITS)) | ((g >> _QUANT_SHIFT) << _QUANT_BITS) | (b >> _QUANT_SHIFT)
+def _representative(value):
+    return min(255, ((value >> _QUANT_SHIFT) << _QUANT_SHIFT) + (1 << (_QUANT_SHIFT - 1)))
+def nearest_256(r, g, b):
+    global _quantized_256
+    if _quantized_256 is None: _quantized_256 = array('h', [-1]) * (1 << (3 * _QUANT_BITS))
+    key = _quantized_key(r, g, b)
+    index = _quantized_256[key]
+    if index < 0:
+        index = _quantized_256[key] = _compute_256(_representative(r), _representative(g), _representative(b))
+    return index
+def nearest_16(r, g, b):
+    global _quantized_16
+    if _quantized_16 is None: _quantized_16 = array('h', [-1]) * (1 << (3 * _QUANT_BITS))
+    key = _quantized_key(r, g, b)
+    index = _quantized_16[key]
+    if index < 0:
+        index = _quantized_16[key] = _compute_16(_representative(r), _representative(g), _representative(b))
+    return index
+def xterm_rgb(index):
+    if index < 16: return _BASIC_PALETTE[index]
+    if index < 232:
+        index -= 16
+        return _CUBE_LEVELS[index // 36], _CUBE_LEVELS[index // 6 % 6], _CUBE_LEVELS[index % 6]
+    level = 8 + (index - 232) * 10
+    return level, level, level
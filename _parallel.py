@@ -0,0 +1,27 @@
+from concurrent.futures import ProcessPoolExecutor
+from . import _parse_inline_markdown, visible_len
+from ._table import _table_row
+_CHUNKS_PER_WORKER = 4
+def _chunked(rows, chunk_count):
+    size = max(1, -(-len(rows) // chunk_count))
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+def _chunk_widths(rows, num_columns):
+    widths = [0] * num_columns
+    for row in rows:
+        for i, cell in enumerate(row[:num_columns]):
+            cell_len = visible_len(_parse_inline_markdown(cell))
+            if cell_len > widths[i]: widths[i] = cell_len
+    return widths
+def _render_chunk(rows, style, column_widths, alignments):
+    num_columns = len(column_widths)
+    return [_table_row(style, [_parse_inline_markdown(cell) for cell in row[:num_columns]], column_widths, alignments) for row in rows]
+def render_rows_parallel(style, parsed_headers, alignments, data_rows, workers):
+    num_columns = len(parsed_headers)
+    chunks = _chunked(data_rows, workers * _CHUNKS_PER_WORKER)
+    column_widths = [visible_len(header) for header in parsed_headers]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for widths in executor.map(_chunk_widths, chunks, [num_columns] * len(chunks)):
+            column_widths = [max(a, b) for a, b in zip(column_widths, widths)]
+        count = len(chunks)
+        rendered = list(executor.map(_render_chunk, chunks, [style] * count, [column_widths] * count, [alignments] * count))
+    return column_widths, [line for chunk in rendered for line in chunk]
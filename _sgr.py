@@ -0,0 +1,95 @@
+import re
+_ansi_split_regex = re.compile(r'(\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~]))')
+_sgr_regex = re.compile(r'\x1b\[([0-9;]*)m')
+FG, BG, BOLD, DIM, ITALIC, UNDERLINE, BLINK, REVERSE, STRIKE = range(9)
+DEFAULT_STATE = (None, None, False, False, False, False, False, False, False)
+_RESET = "\033[0m"
+_attribute_on = {1: BOLD, 2: DIM, 3: ITALIC, 4: UNDERLINE, 5: BLINK, 7: REVERSE, 9: STRIKE}
+_attribute_off = {22: (BOLD, DIM), 23: (ITALIC,), 24: (UNDERLINE,), 25: (BLINK,), 27: (REVERSE,), 29: (STRIKE,)}
+_attribute_codes = ((BOLD, "1"), (DIM, "2"), (ITALIC, "3"), (UNDERLINE, "4"), (BLINK, "5"), (REVERSE, "7"), (STRIKE, "9"))
+_attribute_off_codes = ((ITALIC, "23"), (UNDERLINE, "24"), (BLINK, "25"), (REVERSE, "27"), (STRIKE, "29"))
+class UnsupportedSGR(ValueError):
+    pass
+def apply_sgr(state, params):
+    state = list(state)
+    codes = params.split(';') if params else ['0']
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        i += 1
+        if code == '' or code.strip('0') == '':
+            state = list(DEFAULT_STATE)
+            continue
+        n = int(code)
+        if n in _attribute_on: state[_attribute_on[n]] = True
+        elif n in _attribute_off:
+            for field in _attribute_off[n]: state[field] = False
+        elif 30 <= n <= 37 or 90 <= n <= 97: state[FG] = str(n)
+        elif n == 39: state[FG] = None
+        elif 40 <= n <= 47 or 100 <= n <= 107: state[BG] = str(n)
+        elif n == 49: state[BG] = None
+        elif n in (38, 48):
+            mode = codes[i] if i < len(codes) else ''
+            size = 2 if mode == '5' else 4 if mode == '2' else 0
+            values = codes[i + 1:i + size]
+            if not size or len(values) != size - 1 or not all(v.isdigit() for v in values):
+                raise UnsupportedSGR(params)
+            state[FG if n == 38 else BG] = ';'.join([str(n), mode] + [str(int(v)) for v in values])
+            i += size
+        else:
+            raise UnsupportedSGR(params)
+    return tuple(state)
+def state_params(state):
+    params = [code for field, code in _attribute_codes if state[field]]
+    if state[FG]: params.append(state[FG])
+    if state[BG]: params.append(state[BG])
+    return params
+def transition(current, target):
+    if target == DEFAULT_STATE: return _RESET
+    full = "0;" + ";".join(state_params(target))
+    diff = []
+    intensity_cleared = (current[BOLD] and not target[BOLD]) or (current[DIM] and not target[DIM])
+    if intensity_cleared: diff.append("22")
+    for field, code in _attribute_off_codes:
+        if current[field] and not target[field]: diff.append(code)
+    for field, code in _attribute_codes:
+        if target[field] and (not current[field] or (intensity_cleared and field in (BOLD, DIM))): diff.append(code)
+    if target[FG] != current[FG]: diff.append(target[FG] or "39")
+    if target[BG] != current[BG]: diff.append(target[BG] or "49")
+    diff = ";".join(diff)
+    return f"\033[{diff if len(diff) <= len(full) else full}m"
+def _blank_equivalent(a, b):
+    if a[REVERSE] or b[REVERSE]: return a == b
+    return a[BG] == b[BG] and a[UNDERLINE] == b[UNDERLINE] and a[STRIKE] == b[STRIKE]
+def _minimize(text):
+    out = []
+    desired = emitted = DEFAULT_STATE
+    for line_index, line in enumerate(text.split('\n')):
+        if line_index:
+            if emitted != desired:
+                out.append(transition(emitted, desired))
+                emitted = desired
+            out.append('\n')
+        for index, part in enumerate(_ansi_split_regex.split(line)):
+            if index % 2:
+                match = _sgr_regex.fullmatch(part)
+                if match: desired = apply_sgr(desired, match.group(1))
+                elif part.startswith('\x1b[') and part.endswith('m'): raise UnsupportedSGR(part)
+                else:
+                    if emitted != desired:
+                        out.append(transition(emitted, desired))
+                        emitted = desired
+                    out.append(part)
+            elif part:
+                if emitted != desired and not (not part.strip(' ') and _blank_equivalent(emitted, desired)):
+                    out.append(transition(emitted, desired))
+                    emitted = desired
+                out.append(part)
+    if emitted != desired: out.append(transition(emitted, desired))
+    return ''.join(out)
+def minimize_ansi(text):
+    if '\x1b' not in text: return text
+    try:
+        return _minimize(text)
+    except UnsupportedSGR:
+        return text
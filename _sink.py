@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import threading
+from . import _compile_style, _render_lines, printc
+class ConsoleWriter:
+    def __init__(self, file=None):
+        self.file = file
+        self._lock = threading.RLock()
+    @property
+    def stream(self):
+        return self.file if self.file is not None else sys.stdout
+    def write(self, text):
+        with self._lock:
+            stream = self.stream
+            stream.write(text)
+            stream.flush()
+        return len(text)
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+    def isatty(self):
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+    def printc(self, content, styles=None, markdown=False, **kwargs):
+        printc(content, styles, markdown, file=self, **kwargs)
+class AsyncConsoleWriter:
+    def __init__(self, file=None, max_queue=0):
+        self.file = file
+        self.max_queue = max_queue
+        self._queue = None
+        self._task = None
+        self._error = None
+    @property
+    def stream(self):
+        return self.file if self.file is not None else sys.stdout
+    def isatty(self):
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            pending = [await self._queue.get()]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            texts = []
+            for text in pending:
+                if text is None: stopping = True
+                else: texts.append(text)
+            try:
+                if texts: await asyncio.to_thread(self._write, "".join(texts))
+            except Exception as error:
+                if self._error is None: self._error = error
+            finally:
+                for _ in pending: self._queue.task_done()
+    def _write(self, text):
+        stream = self.stream
+        stream.write(text)
+        stream.flush()
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None: raise error
+    async def write(self, text):
+        self._raise_error()
+        self.start()
+        await self._queue.put(text)
+        return len(text)
+    async def drain(self):
+        if self._queue is not None: await self._queue.join()
+        self._raise_error()
+    async def aclose(self):
+        if self._task is None: return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+        self._raise_error()
+    async def __aenter__(self):
+        return self.start()
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+        return False
+    async def aprintc(self, content, styles=None, markdown=False, **kwargs):
+        await aprintc(content, styles, markdown, file=self, **kwargs)
+def _write_block(out, text):
+    out.write(text)
+    out.flush()
+async def aprintc(content, styles=None, markdown=False, file=None, **kwargs):
+    out = file if file is not None else sys.stdout
+    style = _compile_style(styles, kwargs, out)
+    if style.hidden:
+        return
+    text = "".join(line + "\n" for line in _render_lines(content, style, markdown))
+    if isinstance(out, AsyncConsoleWriter): await out.write(text)
+    else: await asyncio.to_thread(_write_block, out, text)
@@ -0,0 +1,299 @@
+import csv
+import dataclasses
+import functools
+import itertools
+import numbers
+import re
+import sys
+from collections.abc import Mapping, Sequence
+from . import (
+    Style, _WRITE_CHUNK_SIZE, _alignment_padding, _compile_style, _parse_inline_markdown, _parse_style_string,
+    _resolve_width, _table_separator_regex, compile_style, visible_len,
+)
+from ._ir import Block, _DEFAULT, _ansi_line, _state_codes, _text_spans
+from ._wrap import wrap_visible
+from .ansi import truncate
+def _parse_markdown_table(lines):
+    if not lines or len(lines) < 2: raise ValueError("Markdown table requires at least header and separator lines.")
+    header_line = lines[0]; separator_line = lines[1]; data_lines = lines[2:]
+    if '|' not in header_line or not _table_separator_regex.match(separator_line): raise ValueError("Input does not look like a valid Markdown table.")
+    headers = [h.strip() for h in header_line.strip('|').split('|')]
+    num_columns = len(headers)
+    alignments = []
+    parts = separator_line.strip('|').split('|')
+    if len(parts) != num_columns: 
+        num_columns = min(len(parts), num_columns)
+        headers = headers[:num_columns]
+        parts = parts[:num_columns]
+    for part in parts:
+        part = part.strip()
+        if part.startswith(':') and part.endswith(':'): alignments.append("center")
+        elif part.endswith(':'): alignments.append("right")
+        else: alignments.append("left") 
+    data_rows = []
+    for line in data_lines:
+        if not line.strip() or '|' not in line : continue
+        cells = [cell.strip() for cell in line.strip('|').split('|')]
+        if len(cells) < num_columns: cells.extend([''] * (num_columns - len(cells)))
+        data_rows.append(cells[:num_columns])
+    return headers, alignments, data_rows
+def _table_rule(style, column_widths, left, middle, right):
+    border_chars = style.table_border_chars
+    _, pad_right, _, pad_left = style.padding
+    h_sep = border_chars.get('h', '-') 
+    rule = border_chars[left] + border_chars[middle].join(h_sep * (width + pad_left + pad_right) for width in column_widths) + border_chars[right]
+    return (style.border_state, rule)
+def _table_width(style, column_widths):
+    _, pad_right, _, pad_left = style.padding
+    return sum(column_widths) + len(column_widths) * (pad_left + pad_right + 1) - 1 + (2 if style.table_border else 0)
+@functools.lru_cache(maxsize=64)
+def _row_frame(style):
+    border_chars = style.table_border_chars
+    _, pad_right, _, pad_left = style.padding
+    if style.table_border:
+        left_edge, separator, right_edge = ((style.border_state, border_chars.get(key, '|')) for key in ('vl', 'v', 'vr'))
+    else:
+        left_edge, separator, right_edge = (), (_DEFAULT, " "), ()
+    cell_left_pad = (style.bg_state, ' ' * pad_left) if pad_left > 0 else ()
+    cell_right_pad = (style.bg_state, ' ' * pad_right) if pad_right > 0 else ()
+    return left_edge, separator, right_edge, cell_left_pad, cell_right_pad
+def _table_row(style, parsed_cells, column_widths, alignments, cell_styles=None):
+    left_edge, separator, right_edge, cell_left_pad, cell_right_pad = _row_frame(style)
+    num_columns = len(column_widths)
+    row = list(left_edge)
+    for i, parsed_cell in enumerate(parsed_cells):
+        if i >= num_columns: continue 
+        cell_style = cell_styles[i] if cell_styles else style
+        alignment = alignments[i] if i < len(alignments) else "left"
+        left_align, right_align = _alignment_padding(visible_len(parsed_cell), column_widths[i], alignment)
+        row += (*cell_left_pad, _DEFAULT, ' ' * left_align, *_text_spans(parsed_cell, cell_style.text_state), _DEFAULT, ' ' * right_align, *cell_right_pad)
+        if i < num_columns - 1: row += separator
+    row += right_edge
+    return tuple(row)
+def _table_row_lines(style, parsed_cells, column_widths, alignments, cell_styles=None):
+    if all(visible_len(cell) <= width for cell, width in zip(parsed_cells, column_widths)):
+        return [_table_row(style, parsed_cells, column_widths, alignments, cell_styles)]
+    wrapped = [
+        wrap_visible(cell, width, _state_codes((cell_styles[i] if cell_styles else style).text_state)) if visible_len(cell) > width else [cell]
+        for i, (cell, width) in enumerate(zip(parsed_cells, column_widths))
+    ]
+    return [
+        _table_row(style, [cell_lines[line_index] if line_index < len(cell_lines) else "" for cell_lines in wrapped], column_widths, alignments, cell_styles)
+        for line_index in range(max(len(cell_lines) for cell_lines in wrapped))
+    ]
+def _fit_columns(style, column_widths, width_limit):
+    num_columns = len(column_widths)
+    remaining = max(num_columns, width_limit - _table_width(style, [0] * num_columns))
+    if sum(column_widths) <= remaining: return column_widths
+    ordered = sorted(column_widths)
+    for i, width in enumerate(ordered):
+        if width * (num_columns - i) > remaining: break
+        remaining -= width
+    cap, extra = divmod(remaining, num_columns - i)
+    fitted = []
+    for width in column_widths:
+        if width > cap:
+            width = cap + (extra > 0)
+            extra -= 1
+        fitted.append(width)
+    return fitted
+def _measure_columns(parsed_headers, parsed_rows):
+    column_widths = [visible_len(header) for header in parsed_headers]
+    for row in parsed_rows:
+        for i, cell in enumerate(row):
+            cell_len = visible_len(cell)
+            if cell_len > column_widths[i]: column_widths[i] = cell_len
+    return column_widths
+def _assemble_table(style, parsed_headers, column_widths, alignments, row_lines):
+    has_border = style.table_border
+    output_lines = []
+    if has_border:
+        output_lines.append(_table_rule(style, column_widths, 'tl', 'ht', 'tr'))
+    output_lines.extend(_table_row_lines(style, parsed_headers, column_widths, alignments))
+    if has_border:
+        output_lines.append(_table_rule(style, column_widths, 'vl', 'hc', 'vr'))
+    output_lines.extend(row_lines)
+    if has_border:
+        output_lines.append(_table_rule(style, column_widths, 'bl', 'hb', 'br'))
+    return Block(output_lines, _table_width(style, column_widths), style.color_mode, style.minimize)
+def _column_styles(style, column_styles, headers):
+    if not column_styles: return None
+    cell_styles = [style] * len(headers)
+    for key, column_style in column_styles.items():
+        if isinstance(column_style, Style): overrides = dict(column_style.styles)
+        elif isinstance(column_style, str): overrides = _parse_style_string(column_style)
+        else: overrides = dict(column_style or {})
+        cell_styles[_column_index(key, headers)] = _compile_style(style, overrides)
+    return cell_styles
+def _column_index(key, headers):
+    if isinstance(key, int) and not isinstance(key, bool):
+        if -len(headers) <= key < len(headers): return key % len(headers)
+        raise ValueError(f"Column index {key} is out of range for {len(headers)} columns.")
+    try:
+        return list(headers).index(key)
+    except ValueError:
+        raise ValueError(f"Unknown column {key!r}.") from None
+def _fitted_rows(style, parsed_rows, column_widths, alignments, width_limit, cell_styles=None):
+    fitted_widths = _fit_columns(style, column_widths, width_limit) if width_limit is not None else column_widths
+    if fitted_widths is column_widths:
+        return column_widths, [_table_row(style, row, column_widths, alignments, cell_styles) for row in parsed_rows]
+    return fitted_widths, [line for row in parsed_rows for line in _table_row_lines(style, row, fitted_widths, alignments, cell_styles)]
+_PARALLEL_MIN_ROWS = 20000
+def _render_markdown_table(headers, alignments, data_rows, styles, workers=None):
+    style = compile_style(styles)
+    num_columns = len(headers)
+    parsed_headers = [_parse_inline_markdown(header) for header in headers]
+    width_limit = _resolve_width(style)
+    if workers and workers > 1 and len(data_rows) >= _PARALLEL_MIN_ROWS and width_limit is None:
+        from ._parallel import render_rows_parallel
+        column_widths, row_lines = render_rows_parallel(style, parsed_headers, alignments, data_rows, workers)
+    else:
+        parsed_rows = [[_parse_inline_markdown(cell) for cell in row[:num_columns]] for row in data_rows]
+        column_widths = _measure_columns(parsed_headers, parsed_rows)
+        column_widths, row_lines = _fitted_rows(style, parsed_rows, column_widths, alignments, width_limit)
+    return _assemble_table(style, parsed_headers, column_widths, alignments, row_lines)
+_STREAM_SAMPLE_SIZE = 100
+def stream_table(headers, rows, alignments=None, widths=None, sample=_STREAM_SAMPLE_SIZE, styles=None, overflow="truncate", markdown=True, column_styles=None, **kwargs):
+    style = compile_style(styles, **kwargs)
+    if style.hidden:
+        return
+    if overflow not in ("truncate", "wrap"):
+        raise ValueError(f"overflow must be 'truncate' or 'wrap', not {overflow!r}")
+    num_columns = len(headers)
+    if not num_columns: return
+    alignments = list(alignments) if alignments else ["left"] * num_columns
+    def parse_cell(cell):
+        if cell is None: return ""
+        return _parse_inline_markdown(cell) if markdown else str(cell)
+    def parse_row(row):
+        cells = [parse_cell(cell) for cell in itertools.islice(row, num_columns)]
+        if len(cells) < num_columns: cells.extend([''] * (num_columns - len(cells)))
+        return cells
+    parsed_headers = parse_row(headers)
+    cell_styles = _column_styles(style, column_styles, headers)
+    rows = iter(rows)
+    sampled_rows = []
+    if widths is None:
+        sampled_rows = [parse_row(row) for row in itertools.islice(rows, max(0, sample))]
+        column_widths = _measure_columns(parsed_headers, sampled_rows)
+    else:
+        column_widths = [max(0, int(width)) for width in widths][:num_columns]
+        if len(column_widths) < num_columns:
+            raise ValueError(f"Expected {num_columns} column widths, got {len(column_widths)}.")
+    width_limit = _resolve_width(style)
+    if width_limit is not None: column_widths = _fit_columns(style, column_widths, width_limit)
+    def fit_row(cells, cell_styles=None):
+        if overflow == "truncate":
+            yield _ansi_line(_table_row(style, [truncate(cell, width) for cell, width in zip(cells, column_widths)], column_widths, alignments, cell_styles), style.color_mode)
+            return
+        for line in _table_row_lines(style, cells, column_widths, alignments, cell_styles): yield _ansi_line(line, style.color_mode)
+    has_border = style.table_border
+    if has_border:
+        yield _ansi_line(_table_rule(style, column_widths, 'tl', 'ht', 'tr'), style.color_mode)
+    yield from fit_row(parsed_headers)
+    if has_border:
+        yield _ansi_line(_table_rule(style, column_widths, 'vl', 'hc', 'vr'), style.color_mode)
+    for row in sampled_rows:
+        yield from fit_row(row, cell_styles)
+    sampled_rows = None
+    for row in rows:
+        yield from fit_row(parse_row(row), cell_styles)
+    if has_border:
+        yield _ansi_line(_table_rule(style, column_widths, 'bl', 'hb', 'br'), style.color_mode)
+_numeric_regex = re.compile(r'[-+]?(?:\d[\d,_]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?%?')
+def _is_numeric(value):
+    if isinstance(value, bool): return False
+    if isinstance(value, numbers.Number): return True
+    return isinstance(value, str) and _numeric_regex.fullmatch(value.strip()) is not None
+def _table_source(rows, headers):
+    if hasattr(rows, "read"): rows = csv.reader(rows)
+    lazy = not isinstance(rows, Sequence)
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None: return list(headers or []), iter(()), lazy
+    iterator = itertools.chain([first], iterator)
+    if isinstance(first, Mapping):
+        keys = list(headers) if headers is not None else list(first.keys())
+        return keys, ([row.get(key) for key in keys] for row in iterator), lazy
+    if dataclasses.is_dataclass(first) and not isinstance(first, type):
+        names = list(headers) if headers is not None else [field.name for field in dataclasses.fields(first)]
+        return names, ([getattr(row, name) for name in names] for row in iterator), lazy
+    if headers is None:
+        fields = getattr(first, "_fields", None)
+        if fields:
+            headers = list(fields)
+        else:
+            headers = ["" if value is None else str(value) for value in first]
+            next(iterator)
+    return list(headers), (list(row) for row in iterator), lazy
+def _resolve_alignments(align, headers, sample_rows):
+    num_columns = len(headers)
+    if isinstance(align, str): return [align] * num_columns
+    alignments = [None] * num_columns
+    if isinstance(align, Mapping):
+        for key, value in align.items(): alignments[_column_index(key, headers)] = value
+    elif align is not None:
+        for i, value in enumerate(list(align)[:num_columns]): alignments[i] = value
+    for i in range(num_columns):
+        if alignments[i] is None:
+            values = [row[i] for row in sample_rows if i < len(row) and row[i] not in (None, "")]
+            alignments[i] = "right" if values and all(_is_numeric(value) for value in values) else "left"
+    return alignments
+def _render_table_lines(rows, headers, align, styles, column_styles, markdown, sample, kwargs, stream=None):
+    style = _compile_style(styles, kwargs, stream)
+    if style.hidden: return False, iter(())
+    headers, row_iter, lazy = _table_source(rows, headers)
+    if not headers: return False, iter(())
+    if lazy:
+        sampled_rows = list(itertools.islice(row_iter, max(0, sample)))
+        alignments = _resolve_alignments(align, headers, sampled_rows)
+        lines = stream_table(headers, itertools.chain(sampled_rows, row_iter), alignments, sample=sample, styles=style, markdown=markdown, column_styles=column_styles)
+        return True, lines
+    return False, iter(_table_block(style, headers, row_iter, align, column_styles, markdown).ansi_lines())
+def _table_block(style, headers, row_iter, align, column_styles, markdown):
+    num_columns = len(headers)
+    if not num_columns: return Block()
+    def parse_cell(cell):
+        if cell is None: return ""
+        return _parse_inline_markdown(cell) if markdown else str(cell)
+    data_rows = list(row_iter)
+    alignments = _resolve_alignments(align, headers, data_rows)
+    parsed_headers = [parse_cell(header) for header in headers]
+    parsed_rows = []
+    for row in data_rows:
+        cells = [parse_cell(cell) for cell in row[:num_columns]]
+        if len(cells) < num_columns: cells.extend([''] * (num_columns - len(cells)))
+        parsed_rows.append(cells)
+    column_widths = _measure_columns(parsed_headers, parsed_rows)
+    cell_styles = _column_styles(style, column_styles, headers)
+    column_widths, row_lines = _fitted_rows(style, parsed_rows, column_widths, alignments, _resolve_width(style), cell_styles)
+    return _assemble_table(style, parsed_headers, column_widths, alignments, row_lines)
+def render_table(rows, headers=None, align=None, styles=None, column_styles=None, markdown=False, sample=_STREAM_SAMPLE_SIZE, **kwargs):
+    _, lines = _render_table_lines(rows, headers, align, styles, column_styles, markdown, sample, kwargs)
+    return "\n".join(lines)
+def table_block(rows, headers=None, align=None, styles=None, column_styles=None, markdown=False, **kwargs):
+    style = compile_style(styles, **kwargs)
+    if style.hidden: return Block()
+    headers, row_iter, _ = _table_source(rows, headers)
+    return _table_block(style, headers, row_iter, align, column_styles, markdown)
+def table(rows, headers=None, align=None, styles=None, column_styles=None, markdown=False, sample=_STREAM_SAMPLE_SIZE, file=None, **kwargs):
+    out = file if file is not None else sys.stdout
+    lazy, lines = _render_table_lines(rows, headers, align, styles, column_styles, markdown, sample, kwargs, out)
+    if not lazy:
+        text = "".join(line + "\n" for line in lines)
+        if text:
+            out.write(text)
+            out.flush()
+        return
+    buffer = []
+    buffered_size = 0
+    for line in lines:
+        buffer.append(line)
+        buffer.append("\n")
+        buffered_size += len(line) + 1
+        if buffered_size >= _WRITE_CHUNK_SIZE:
+            out.write("".join(buffer))
+            buffer.clear()
+            buffered_size = 0
+    if buffer: out.write("".join(buffer))
+    out.flush()
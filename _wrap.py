@@ -0,0 +1,79 @@
+from . import _reset_code, visible_len
+from ._sgr import DEFAULT_STATE, UnsupportedSGR, _ansi_split_regex, _sgr_regex, apply_sgr, transition
+from ._width import char_width
+def _char_width(c):
+    return 1 if c < '\x80' else char_width(c)
+_COMPACT_CODES = 32
+def _compact_codes(codes):
+    state = DEFAULT_STATE
+    try:
+        for code in codes:
+            match = _sgr_regex.fullmatch(code)
+            if not match: return None
+            state = apply_sgr(state, match.group(1))
+    except UnsupportedSGR:
+        return None
+    return [] if state == DEFAULT_STATE else [transition(DEFAULT_STATE, state)]
+def wrap_visible(s, width, base=""):
+    width = max(1, width)
+    if visible_len(s) <= width: return [s]
+    lines = []
+    line = []
+    line_width = 0
+    spaces = 0
+    word = []
+    word_width = 0
+    word_codes, word_count = [], 0
+    active_codes = []
+    compact_at = _COMPACT_CODES
+    continued = False
+    close = _reset_code + base
+    for index, part in enumerate(_ansi_split_regex.split(s)):
+        if index % 2:
+            if not word: word_codes, word_count = active_codes, len(active_codes)
+            word.append(part)
+            if part == _reset_code: active_codes = []
+            else:
+                active_codes.append(part)
+                if len(active_codes) >= compact_at:
+                    compacted = _compact_codes(active_codes)
+                    if compacted is None: compact_at *= 2
+                    else: active_codes = compacted
+            continue
+        for c in part:
+            if c == ' ':
+                if word:
+                    if spaces: line.append(' ' * spaces)
+                    line.extend(word)
+                    line_width += spaces + word_width
+                    word = []
+                    word_width = spaces = 0
+                if (line_width or not continued) and line_width + spaces < width: spaces += 1
+                continue
+            char_width = _char_width(c)
+            if line_width + spaces + word_width + char_width > width:
+                if line_width:
+                    codes, count = (word_codes, word_count) if word else (active_codes, len(active_codes))
+                    if count: line.append(close)
+                    lines.append(''.join(line))
+                    line = codes[:count]
+                    line_width = spaces = 0
+                    continued = True
+                else:
+                    spaces = max(0, width - word_width - char_width)
+                if word_width and word_width + char_width > width:
+                    if spaces: line.append(' ' * spaces)
+                    line.extend(word)
+                    if active_codes: line.append(close)
+                    lines.append(''.join(line))
+                    line = active_codes[:]
+                    word = []
+                    word_width = spaces = 0
+                    continued = True
+            if not word: word_codes, word_count = active_codes, len(active_codes)
+            word.append(c)
+            word_width += char_width
+    if spaces: line.append(' ' * spaces)
+    line.extend(word)
+    lines.append(''.join(line))
+    return lines
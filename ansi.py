@@ -0,0 +1,52 @@
+from . import _reset_code, _scan_ansi, strip_ansi as strip, visible_len
+def scan(s):
+    if not isinstance(s, str): s = str(s)
+    if '\x1b' not in s: return s, ()
+    return _scan_ansi(s)
+def _plain_width(plain):
+    if plain.isascii(): return len(plain)
+    from ._width import str_width
+    return str_width(plain)
+def _index_range(plain, start, end):
+    if plain.isascii(): return min(start, len(plain)), min(end, len(plain))
+    from ._width import char_width
+    begin = None
+    column = 0
+    for index, c in enumerate(plain):
+        if begin is None and column >= start: begin = index
+        width = 1 if c < '\x80' else char_width(c)
+        if column + width > end: return (index if begin is None else begin), index
+        column += width
+    return (len(plain) if begin is None else begin), len(plain)
+def _slice(s, start, end):
+    plain, escapes = scan(s)
+    start = max(0, start)
+    begin, stop = _index_range(plain, start, max(start, end))
+    if not escapes or begin == stop: return plain[begin:stop], False
+    out = []
+    active = []
+    position = begin
+    for offset, code in escapes:
+        if offset > stop or (offset == stop and stop < len(plain)): break
+        if offset > begin:
+            if not out: out.extend(active)
+            out.append(plain[position:offset])
+            out.append(code)
+            position = offset
+        if code == _reset_code: active = []
+        elif code[-1] == 'm' and code[1] == '[': active.append(code)
+    if not out: out.extend(active)
+    out.append(plain[position:stop])
+    return "".join(out), bool(active)
+def slice_visible(s, start, end=None):
+    text, styled = _slice(s, start, float("inf") if end is None else end)
+    return text + _reset_code if styled else text
+def truncate(s, width, ellipsis="…"):
+    plain = strip(s)
+    if _plain_width(plain) <= width: return s
+    ellipsis_width = visible_len(ellipsis)
+    if width <= 0: return ""
+    if width < ellipsis_width: return slice_visible(s, 0, width)
+    if width == ellipsis_width: return ellipsis
+    text, styled = _slice(s, 0, width - ellipsis_width)
+    return f"{text}{ellipsis}{_reset_code}" if styled else text + ellipsis
@@ -0,0 +1,300 @@
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from . import (
+    _attributes, _attribute_resets, _parse_inline_markdown, _parse_inline_markdown_cached, _scan_ansi, _visible_len_cached,
+    compile_style, printc, render, strip_ansi, visible_len,
+)
+from . import ansi
+from ._sgr import _ansi_split_regex, minimize_ansi
+from ._table import _parse_markdown_table, _render_markdown_table
+def _legacy_parse_inline_markdown(text):
+    if not isinstance(text, str): text = str(text)
+    text = re.sub(r'(?<!\\)~(.*?)~', f'{_attributes["strikethrough"]}\\1{_attribute_resets["strikethrough"]}', text)
+    text = re.sub(r'(?<!\\)\*\*(.*?)\*\*', f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}', text)
+    text = re.sub(r'(?<!\\)__(.*?)__', f'{_attributes["bold"]}\\1{_attribute_resets["bold"]}', text)
+    text = re.sub(r'(?<!\\)(?<!\w)_(.*?)_(?!\w)', f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}', text)
+    text = re.sub(r'(?<!\\)\*(.*?)\*', f'{_attributes["italic"]}\\1{_attribute_resets["italic"]}', text)
+    text = text.replace('\\*', '*').replace('\\_', '_').replace('\\~', '~')
+    return text
+_legacy_ansi_regex = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+def _legacy_strip_ansi(s):
+    return _legacy_ansi_regex.sub('', s)
+def _legacy_visible_len(s):
+    clean = _legacy_strip_ansi(str(s))
+    try:
+        return sum(2 if ord(c) > 127 else 1 for c in clean)
+    except TypeError:
+        return 0 
+def _legacy_truncate(s, width, ellipsis="…"):
+    if visible_len(s) <= width: return s
+    width -= visible_len(ellipsis)
+    chunks, current, current_width, active_codes = [], [], 0, []
+    for index, part in enumerate(_ansi_split_regex.split(s)):
+        if index % 2:
+            current.append(part)
+            active_codes = [] if part == "\033[0m" else active_codes + [part]
+            continue
+        for c in part:
+            char_width = visible_len(c)
+            if current_width + char_width > width and current_width > 0:
+                chunks.append(''.join(current))
+                current, current_width = active_codes[:], 0
+            current.append(c)
+            current_width += char_width
+    chunks.append(''.join(current))
+    return chunks[0] + ellipsis
+def _table_cells(rows):
+    cells = []
+    for i in range(rows):
+        cells.append(f"job-{i}")
+        cells.append("**FAILED**" if i % 7 == 0 else "ok")
+        cells.append(f"{i * 37 % 1000} ms")
+        cells.append(f"_node-{i % 16}_ on ~rack-{i % 4}~")
+    return cells
+def _best_time(func, args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for arg in args: func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+def bench_inline_markdown(rows=10000, out=sys.stdout):
+    cells = _table_cells(rows)
+    def uncached(text):
+        if '*' not in text and '_' not in text and '~' not in text: return text
+        return _parse_inline_markdown_cached.__wrapped__(text)
+    _parse_inline_markdown_cached.cache_clear()
+    results = [
+        ("legacy chained re.sub", _best_time(_legacy_parse_inline_markdown, cells)),
+        ("gated passes, no cache", _best_time(uncached, cells)),
+        ("gated passes + cache", _best_time(_parse_inline_markdown, cells)),
+    ]
+    baseline = results[0][1]
+    out.write(f"_parse_inline_markdown over {len(cells)} table cells\n")
+    for name, seconds in results:
+        out.write(f"  {name:<24} {seconds * 1000:9.2f} ms  {len(cells) / seconds:12,.0f} cells/s  x{baseline / seconds:.1f}\n")
+def bench_visible_len(count=20000, out=sys.stdout):
+    samples = {
+        "ascii": [f"2025-01-01 12:00:{i % 60:02d} INFO request {i} served in {i % 97} ms" for i in range(count)],
+        "ascii + ansi": [f"\033[32m2025-01-01\033[0m \033[1mINFO\033[22m request {i} served" for i in range(count)],
+        "latin-1 accents": [f"café {i} – résumé naïve façade" for i in range(count)],
+        "cjk": [f"東京 {i} 大阪 名古屋 札幌" for i in range(count)],
+        "repeated cells": ["│ état ─ ok │"] * count,
+    }
+    out.write(f"visible_len over {count} strings per case\n")
+    for name, strings in samples.items():
+        _visible_len_cached.cache_clear()
+        legacy = _best_time(_legacy_visible_len, strings)
+        current = _best_time(visible_len, strings)
+        out.write(f"  {name:<18} legacy {legacy * 1000:8.2f} ms  current {current * 1000:8.2f} ms  x{legacy / current:.1f}\n")
+def bench_ansi(count=2000, out=sys.stdout):
+    lines = _long_log_lines(count)
+    def cold(func):
+        return lambda s: (_scan_ansi.cache_clear(), _visible_len_cached.cache_clear(), func(s))
+    truncate = lambda s: ansi.truncate(s, 80)
+    cases = (
+        ("strip", _legacy_strip_ansi, cold(ansi.strip), ansi.strip),
+        ("visible_len", _legacy_visible_len, cold(ansi.visible_len), ansi.visible_len),
+        ("truncate(80)", lambda s: _legacy_truncate(s, 80), cold(truncate), truncate),
+    )
+    out.write(f"ansi string operations over {count} long log lines (~{sum(map(len, lines)) // count} chars each)\n")
+    for name, legacy, cold, warm in cases:
+        _scan_ansi.cache_clear()
+        _visible_len_cached.cache_clear()
+        regex, scanned, cached = _best_time(legacy, lines), _best_time(cold, lines), _best_time(warm, lines)
+        out.write(f"  {name:<14} regex {regex * 1000:8.2f} ms  scan {scanned * 1000:8.2f} ms  cached {cached * 1000:8.2f} ms  x{regex / cached:.1f}\n")
+def _markdown_table(rows):
+    cells = _table_cells(rows)
+    lines = ["| Job | Status | Latency | Placement |", "| :-- | :-: | --: | :-- |"]
+    lines.extend("| " + " | ".join(cells[i:i + 4]) + " |" for i in range(0, len(cells), 4))
+    return "\n".join(lines)
+def bench_minimize(out=sys.stdout):
+    samples = {
+        "boxed panel": render("\n".join(f"worker {i}: **healthy**" for i in range(20)), "text-#88c0d0 bg-#2e3440 border rounded", markdown=True, padding=(1, 2), color_mode="truecolor"),
+        "plain colored lines": render("\n".join(f"request {i} ok" for i in range(20)), "bold text-green", padding=0, color_mode="truecolor"),
+        "markdown table": render(_markdown_table(200), "text-cyan", markdown=True, padding=1, border_color="white", color_mode="truecolor"),
+    }
+    out.write("minimize_ansi bytes emitted\n")
+    for name, text in samples.items():
+        minimized = minimize_ansi(text)
+        before, after = len(text.encode()), len(minimized.encode())
+        seconds = _best_time(minimize_ansi, [text])
+        out.write(f"  {name:<20} {before:9,d} -> {after:9,d} bytes  saved {100 * (before - after) / before:5.1f}%  {seconds * 1000:7.2f} ms\n")
+def bench_parallel(workers=None, row_counts=(1000, 5000, 20000, 50000, 100000), out=sys.stdout):
+    from ._parallel import render_rows_parallel
+    workers = workers or max(2, os.cpu_count() or 1)
+    out.write(f"table rendering, serial vs process pool ({workers} workers)\n")
+    for rows in row_counts:
+        headers, alignments, data_rows = _parse_markdown_table(_markdown_table(rows).split("\n"))
+        style = compile_style("text-cyan", border=True, padding=1, color_mode="truecolor")
+        parsed_headers = [_parse_inline_markdown(header) for header in headers]
+        _parse_inline_markdown_cached.cache_clear()
+        serial = _best_time(lambda _: _render_markdown_table(headers, alignments, data_rows, style), [None], repeat=2)
+        parallel = _best_time(lambda _: render_rows_parallel(style, parsed_headers, alignments, data_rows, workers), [None], repeat=2)
+        winner = "parallel" if parallel < serial else "serial"
+        out.write(f"  {rows:>7,d} rows  serial {serial * 1000:9.1f} ms  parallel {parallel * 1000:9.1f} ms  x{serial / parallel:.2f}  {winner}\n")
+class _DiscardSink:
+    def write(self, text):
+        return len(text)
+    def flush(self):
+        pass
+    def isatty(self):
+        return False
+class _CountingSink(_DiscardSink):
+    def __init__(self):
+        self.bytes = 0
+    def write(self, text):
+        self.bytes += len(text.encode())
+        return len(text)
+def _log_lines(count):
+    return [f"\033[2m2025-01-01 12:00:{i % 60:02d}\033[0m \033[1;32mINFO\033[0m request {i} served in \033[33m{i % 97} ms\033[0m" for i in range(count)]
+def _long_log_lines(count, records=20):
+    lines = _log_lines(count * records)
+    return [" ".join(lines[i:i + records]) for i in range(0, len(lines), records)]
+def _mixed_strings(count):
+    kinds = ("GET /api/v1/items/{} 200", "\033[31mERROR\033[0m job {} failed", "東京 {} 大阪", "café {} – naïve")
+    return [kinds[i % len(kinds)].format(i) for i in range(count)]
+def _table_case(rows):
+    headers, alignments, data_rows = _parse_markdown_table(_markdown_table(rows).split("\n"))
+    style = compile_style("text-cyan", border=True, padding=1, color_mode="truecolor")
+    return lambda sink: lambda: _render_markdown_table(headers, alignments, data_rows, style).ansi_lines()
+def _export_case(rows, format):
+    headers, alignments, data_rows = _parse_markdown_table(_markdown_table(rows).split("\n"))
+    block = _render_markdown_table(headers, alignments, data_rows, compile_style("text-cyan", border=True, padding=1, color_mode="truecolor"))
+    return lambda sink: lambda: getattr(block, format)()
+def _printc_case(content, styles=None, **kwargs):
+    return lambda sink: lambda: printc(content, styles, file=sink, **kwargs)
+def _batch_case(func, inputs):
+    def run():
+        for value in inputs: func(value)
+    return lambda sink: run
+_panel = "\n".join(f"worker-{i:02d}  **healthy**  uptime {i * 17 % 300}s" for i in range(8))
+CASES = (
+    ("printc/plain", _printc_case("request 42 served in 12 ms", color_mode="none"), False),
+    ("printc/colored", _printc_case("request 42 served in 12 ms", "bold text-#ff8800 bg-#202020", color_mode="truecolor"), False),
+    ("printc/boxed", _printc_case(_panel, "text-cyan border rounded", padding=(1, 2), color_mode="truecolor"), False),
+    ("printc/markdown", _printc_case(_panel, "text-cyan", markdown=True, color_mode="truecolor"), False),
+    ("printc/wrapped", _printc_case(" ".join(_log_lines(40)), "text-cyan border", markdown=True, max_width=80, color_mode="truecolor"), False),
+    ("printc/markdown-table", _printc_case(_markdown_table(20), "text-cyan", markdown=True, border=True, padding=1, color_mode="truecolor"), False),
+    ("table/10", _table_case(10), False),
+    ("table/1k", _table_case(1000), False),
+    ("table/100k", _table_case(100000), True),
+    ("export/plain", _export_case(1000, "plain"), False),
+    ("export/html", _export_case(1000, "html"), False),
+    ("visible_len/1k", _batch_case(visible_len, _mixed_strings(1000)), False),
+    ("inline_markdown/1k", _batch_case(_parse_inline_markdown, _table_cells(250)), False),
+    ("strip_ansi/1k", _batch_case(strip_ansi, _log_lines(1000)), False),
+    ("ansi/strip/long", _batch_case(ansi.strip, _long_log_lines(1000)), False),
+    ("ansi/slice/long", _batch_case(lambda s: ansi.slice_visible(s, 40, 120), _long_log_lines(1000)), False),
+    ("ansi/truncate/long", _batch_case(lambda s: ansi.truncate(s, 80), _long_log_lines(1000)), False),
+)
+def _output_bytes(result):
+    if isinstance(result, str): return len(result.encode())
+    if isinstance(result, list): return sum(len(line.encode()) + 1 for line in result)
+    return 0
+def run_case(make, min_time=0.2, repeat=3):
+    op = make(_DiscardSink())
+    op()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number): op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20: break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number): op()
+        best = min(best, time.perf_counter() - start)
+    counting_sink = _CountingSink()
+    result = make(counting_sink)()
+    emitted = counting_sink.bytes + _output_bytes(result)
+    tracemalloc.start()
+    try:
+        make(_DiscardSink())()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_sec": number / best, "seconds_per_op": best / number, "bytes": emitted, "peak_kib": peak / 1024}
+def import_time(runs=5):
+    parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (parent, os.environ.get("PYTHONPATH")))))
+    best = modules = None
+    for _ in range(runs + 1):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {__package__}"], env=env, capture_output=True, text=True, check=True)
+        rows = [line.split("|") for line in completed.stderr.splitlines() if line.startswith("import time:") and line.count("|") == 2]
+        names = [row[2].strip() for row in rows]
+        cumulative = int(rows[names.index(__package__)][1])
+        best = cumulative if best is None else min(best, cumulative)
+        modules = sum(name.startswith(__package__ + ".") for name in names)
+    seconds = best / 1e6
+    return {"ops_per_sec": 1 / seconds, "seconds_per_op": seconds, "bytes": 0, "peak_kib": 0.0, "modules": modules}
+def run_suite(names=None, quick=False, min_time=0.2, out=sys.stdout):
+    results = {}
+    if not names or any(pattern in "import" for pattern in names):
+        results["import"] = result = import_time()
+        out.write(f"  {'import':<24} {result['seconds_per_op'] * 1000:14,.1f} ms     {result['modules']:12,d} submodules\n")
+    for name, make, slow in CASES:
+        if names and not any(pattern in name for pattern in names): continue
+        if quick and slow: continue
+        results[name] = result = run_case(make, min_time)
+        out.write(f"  {name:<24} {result['ops_per_sec']:14,.1f} ops/s  {result['bytes']:12,d} bytes  {result['peak_kib']:10,.1f} KiB peak\n")
+    return results
+def compare(results, baseline, threshold, out=sys.stdout):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous: continue
+        ratio = result["ops_per_sec"] / previous["ops_per_sec"]
+        flag = ""
+        if ratio < 1 - threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        out.write(f"  {name:<24} {previous['ops_per_sec']:14,.1f} -> {result['ops_per_sec']:14,.1f} ops/s  x{ratio:.2f}{flag}\n")
+    return regressions
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m color.bench", description="Benchmark the color rendering hot paths.")
+    parser.add_argument("cases", nargs="*", help="only run cases whose name contains one of these substrings")
+    parser.add_argument("--quick", action="store_true", help="skip the slow cases (100k-row table)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing run (default: 0.2)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON to PATH ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a JSON file written by --json")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed ops/sec drop versus the baseline (default: 0.1)")
+    parser.add_argument("--legacy", action="store_true", help="also compare against the previous implementations")
+    parser.add_argument("--parallel", type=int, nargs="?", const=0, metavar="WORKERS", help="also measure the serial/process-pool crossover for table rendering")
+    args = parser.parse_args(argv)
+    report = sys.stderr if args.json == "-" else sys.stdout
+    report.write("cases\n")
+    results = run_suite(args.cases, args.quick, args.min_time, report)
+    if args.legacy:
+        bench_inline_markdown(out=report)
+        bench_visible_len(out=report)
+        bench_minimize(out=report)
+        bench_ansi(out=report)
+    if args.parallel is not None:
+        bench_parallel(args.parallel or None, out=report)
+    if args.json:
+        document = {"python": platform.python_version(), "platform": platform.platform(), "timestamp": time.time(), "cases": results}
+        if args.json == "-":
+            json.dump(document, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(args.json, "w", encoding="utf-8") as handle: json.dump(document, handle, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle: baseline = json.load(handle).get("cases", {})
+        report.write(f"comparison against {args.baseline} (threshold {args.threshold:.0%})\n")
+        regressions = compare(results, baseline, args.threshold, report)
+        if regressions:
+            report.write(f"{len(regressions)} regression(s): {', '.join(regressions)}\n")
+            return 1
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+from .. import _scan_ansi, ansi, strip_ansi, visible_len
+_LINE = "\x1b[31m漢字\x1b[0m ok\x1b[K"
+def test_core_helpers_share_the_ansi_scan():
+    assert strip_ansi is ansi.strip and visible_len is ansi.visible_len
+    _scan_ansi.cache_clear()
+    assert strip_ansi(_LINE) == "漢字 ok"
+    assert ansi.scan(_LINE)[0] == strip_ansi(_LINE)
+    assert _scan_ansi.cache_info().misses == 1
+def test_widths_count_wide_characters():
+    assert visible_len(_LINE) == 7
+    assert ansi.truncate(_LINE, 4) == "\x1b[31m漢…\x1b[0m"
+    assert strip_ansi(5) == "5"
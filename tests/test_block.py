@@ -0,0 +1,22 @@
+from .. import render_block
+from .._ir import _STATES_SIZE, _line_codes, _state
+def test_html_keeps_colors_whatever_the_color_mode():
+    for color_mode in ("none", "16", "256", "truecolor"):
+        html = render_block("hi", "text-#123456 bold border", color_mode=color_mode).html()
+        assert '<span style="color:#123456;font-weight:bold">hi</span>' in html
+def test_ansi_reduces_colors_per_call():
+    block = render_block("hi", "text-#123456", color_mode="none")
+    assert block.ansi() == " hi "
+    assert "\x1b[38;2;18;52;86m" in block.ansi(color_mode="truecolor")
+    assert "\x1b[38;5;" in block.ansi(color_mode="256")
+def test_interned_states_keep_value_hashing_after_the_table_is_cleared():
+    values = (1, None, True, False, False, False, False, False, False)
+    before = _state(values)
+    for index in range(_STATES_SIZE):
+        _state(((index, 0, 0), None, False, False, False, False, False, False, False))
+    after = _state(values)
+    assert before == after and hash(before) == hash(after)
+    _line_codes((before,), "truecolor")
+    hits = _line_codes.cache_info().hits
+    _line_codes((after,), "truecolor")
+    assert _line_codes.cache_info().hits == hits + 1
@@ -0,0 +1,22 @@
+import gc
+import io
+import weakref
+from .. import _detected_color_mode, printc
+def test_detected_mode_cache_does_not_keep_streams_alive():
+    stream = io.StringIO()
+    ref = weakref.ref(stream)
+    printc("hi", "text-red", file=stream)
+    assert _detected_color_mode(stream) == "none"
+    del stream
+    gc.collect()
+    assert ref() is None
+def test_streams_without_weakref_support_are_detected_each_call():
+    class Stream:
+        __slots__ = ("text",)
+        def __init__(self): self.text = ""
+        def write(self, text): self.text += text
+        def flush(self): pass
+    stream = Stream()
+    printc("hi", "text-red", file=stream)
+    printc("hi", "text-red", file=stream)
+    assert stream.text == " hi \n hi \n"
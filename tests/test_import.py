@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+_PACKAGE = __package__.rpartition(".")[0]
+_SCRIPT = """
+import sys
+import {package} as color
+print(",".join(name for name in ("_table", "_width", "_palette", "_sink", "asyncio") if name in sys.modules or "{package}." + name in sys.modules))
+print(color.table.__module__, color.LiveRegion.__module__)
+"""
+def test_import_loads_only_the_styling_core():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get("PYTHONPATH")))))
+    completed = subprocess.run([sys.executable, "-c", _SCRIPT.format(package=_PACKAGE)], env=env, capture_output=True, text=True, check=True)
+    loaded, resolved = completed.stdout.splitlines()
+    assert loaded == ""
+    assert resolved == f"{_PACKAGE}._table {_PACKAGE}._live"
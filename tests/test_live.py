@@ -0,0 +1,65 @@
+import io
+import re
+import time
+from .. import LiveRegion
+_control_regex = re.compile(r"\r|\n|\x1b\[(\d*)([ABK])")
+def _screen(output):
+    lines, row, col = [""], 0, 0
+    def put(text):
+        nonlocal col
+        line = lines[row].ljust(col)
+        lines[row] = line[:col] + text + line[col + len(text):]
+        col += len(text)
+    position = 0
+    for match in _control_regex.finditer(output):
+        put(output[position:match.start()])
+        position = match.end()
+        token, (count, command) = match.group(), match.groups()
+        if token == "\r": col = 0
+        elif token == "\n":
+            row, col = row + 1, 0
+            if row == len(lines): lines.append("")
+        elif command == "A": row -= int(count or 1)
+        elif command == "B": row += int(count or 1)
+        else: lines[row] = lines[row][:col]
+    put(output[position:])
+    return [line.rstrip() for line in (lines[:-1] if lines[-1] == "" else lines)]
+def _region(**kwargs):
+    stream = io.StringIO()
+    return stream, LiveRegion(file=stream, max_refresh=0, **kwargs)
+def _update(live, *lines):
+    live.update("\n".join(lines), padding=0)
+def test_unchanged_lines_are_skipped():
+    stream, live = _region()
+    _update(live, "alpha", "beta", "gamma")
+    drawn = len(stream.getvalue())
+    _update(live, "alpha", "BETA", "gamma")
+    redraw = stream.getvalue()[drawn:]
+    assert "BETA" in redraw and "alpha" not in redraw and "gamma" not in redraw
+    assert _screen(stream.getvalue()) == ["alpha", "BETA", "gamma"]
+    drawn = len(stream.getvalue())
+    _update(live, "alpha", "BETA", "gamma")
+    assert len(stream.getvalue()) == drawn
+def test_region_grows_and_shrinks():
+    stream, live = _region()
+    _update(live, "one", "two")
+    _update(live, "one", "two", "three", "four")
+    assert _screen(stream.getvalue()) == ["one", "two", "three", "four"]
+    _update(live, "only")
+    assert _screen(stream.getvalue()) == ["only", "", "", ""]
+def test_height_reserves_lines():
+    stream, live = _region(height=3)
+    with live:
+        _update(live, "top")
+    assert _screen(stream.getvalue()) == ["top", "", ""]
+def test_throttled_update_is_drawn_by_the_timer():
+    stream = io.StringIO()
+    live = LiveRegion(file=stream, max_refresh=20)
+    _update(live, "first")
+    _update(live, "second")
+    assert _screen(stream.getvalue()) == ["first"]
+    deadline = time.monotonic() + 2
+    while "second" not in stream.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _screen(stream.getvalue()) == ["second"]
+    assert live._timer is None
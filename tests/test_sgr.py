@@ -0,0 +1,63 @@
+import random
+import pytest
+from .. import render, render_table
+from .._sgr import (
+    BG, DEFAULT_STATE, REVERSE, STRIKE, UNDERLINE, _ansi_split_regex, _sgr_regex, apply_sgr, minimize_ansi,
+)
+_TABLE = "| H1 | **H2** | H3 |\n|:--|:-:|--:|\n| a _b_ | ~c~ | 1 |\n| long cell | x | 22 |"
+_STYLES = (
+    "bold text-red", "text-#336699 bg-#eeeeee border rounded", "italic underline bg-blue",
+    "reverse text-green border", "dim blink strikethrough bg-yellow",
+)
+_CODES = (
+    "\x1b[0m", "\x1b[1m", "\x1b[22m", "\x1b[31m", "\x1b[39m", "\x1b[44m", "\x1b[49m", "\x1b[7m", "\x1b[27m",
+    "\x1b[4m", "\x1b[38;5;100m", "\x1b[48;2;1;2;3m", "\x1b[2m", "\x1b[1;32;41m", "\x1b[m", "\x1b[K",
+)
+def _screen(text):
+    state = DEFAULT_STATE
+    cells = []
+    for line in text.split("\n"):
+        row = []
+        for index, part in enumerate(_ansi_split_regex.split(line)):
+            if index % 2:
+                match = _sgr_regex.fullmatch(part)
+                if match: state = apply_sgr(state, match.group(1))
+                else: row.append(("escape", part, state))
+                continue
+            for c in part:
+                if c == " " and not state[REVERSE]: row.append((c, state[BG], state[UNDERLINE], state[STRIKE]))
+                else: row.append((c, state))
+        cells.append(row)
+    return cells, state
+def _rendered_cases():
+    for styles in _STYLES:
+        for padding in (0, 1, (1, 3)):
+            options = dict(markdown=True, padding=padding, color_mode="truecolor")
+            yield render("Hello **world**\nsecond _line_ here", styles, border_color="magenta", **options)
+            yield render(_TABLE, styles, **options)
+    yield render_table([{"name": "db", "status": "**up**", "ms": 12}, {"name": "cache", "status": "~down~", "ms": 340}], styles="text-cyan bg-#202020", padding=1, markdown=True, color_mode="truecolor")
+    for mode in ("256", "16"):
+        yield render(_TABLE, "text-#ff8800 bg-#101010 border", markdown=True, padding=1, color_mode=mode)
+def _random_cases(count=3000, seed=0):
+    rng = random.Random(seed)
+    pieces = _CODES + ("ab", "  ", " ", "\n", "│")
+    for _ in range(count):
+        yield "".join(rng.choice(pieces) for _ in range(rng.randint(1, 25)))
+@pytest.mark.parametrize("text", list(_rendered_cases()))
+def test_minimized_render_is_visually_identical(text):
+    minimized = minimize_ansi(text)
+    assert _screen(minimized) == _screen(text)
+    assert len(minimized) <= len(text)
+@pytest.mark.parametrize("styles", _STYLES)
+def test_minimize_style_option_is_visually_identical(styles):
+    options = dict(markdown=True, padding=1, color_mode="truecolor")
+    for content in ("Hello **world**\nsecond _line_ here", _TABLE):
+        assert _screen(render(content, styles, minimize=True, **options)) == _screen(render(content, styles, **options))
+def test_minimized_random_sgr_is_visually_identical():
+    for text in _random_cases():
+        assert _screen(minimize_ansi(text)) == _screen(text), repr(text)
+def test_minimize_leaves_unsupported_sgr_untouched():
+    text = "\x1b[58;5;3mcurly\x1b[0m \x1b[1mbold\x1b[0m"
+    assert minimize_ansi(text) == text
+def test_minimize_without_escapes_is_identity():
+    assert minimize_ansi("plain\ntext") == "plain\ntext"
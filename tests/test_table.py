@@ -0,0 +1,20 @@
+import dataclasses
+from .. import render_table, stream_table
+@dataclasses.dataclass
+class _Row:
+    name: str
+    count: int
+    note: str = ""
+_ROWS = [_Row("a", 1, "x"), _Row("bb", 22, "y")]
+def _cells(text):
+    return [[cell.strip() for cell in line[1:-1].split("│")] for line in text.split("\n")[1:-1] if "─" not in line]
+def test_dataclass_rows_use_all_fields_by_default():
+    assert _cells(render_table(_ROWS, color_mode="none")) == [["name", "count", "note"], ["a", "1", "x"], ["bb", "22", "y"]]
+def test_dataclass_headers_select_and_order_fields():
+    assert _cells(render_table(_ROWS, headers=["count", "name"], color_mode="none")) == [["count", "name"], ["1", "a"], ["22", "bb"]]
+    assert _cells(render_table(_ROWS, headers=["note"], color_mode="none")) == [["note"], ["x"], ["y"]]
+def test_dataclass_headers_match_dict_rows():
+    dict_rows = [dataclasses.asdict(row) for row in _ROWS]
+    assert render_table(_ROWS, headers=["note", "count"], color_mode="none") == render_table(dict_rows, headers=["note", "count"], color_mode="none")
+def test_stream_table_without_columns_draws_nothing():
+    assert list(stream_table([], [[1], [2]], border=True, color_mode="none")) == []